@@ -8,15 +8,8 @@ import tkinter.messagebox
 from Logic3 import Influence
 from matrix import StrictMatrix
 from maps import IslandMap, FriendMap
-
-try:
-    from winsound import PlaySound, SND_FILENAME, SND_ASYNC
-except ImportError:
-    music = None
-    play = lambda filename: None
-else:
-    import music
-    play = lambda filename: PlaySound(filename, SND_FILENAME | SND_ASYNC)
+import music
+from music import play
 
 ################################################################################
 
@@ -216,8 +209,7 @@ class Board(ttk.Frame):
 
 def main():
     "Start both the music and GUI of application."
-    if music is not None:
-        music.start('background.wav')
+    music.start('background.wav')
     tkinter.NoDefaultRoot()
     root = tkinter.Tk()
     root.resizable(False, False)
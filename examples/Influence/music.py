@@ -1,12 +1,250 @@
 #! /usr/bin/env python3
-from winsound import PlaySound, SND_FILENAME
-from multiprocessing import Process
+"""Play background music and sound effects.
+
+WAV files are read and decoded into 16-bit mono PCM at RATE samples
+per second once. One thread mixes the looping music with the effects
+that are playing and streams the result, CHUNK samples at a time, to
+a single sink:
+
+    Pipe        one long-running player such as aplay reading stdin
+    WinSound    winsound, one chunk after another (on Windows)
+    Null        nothing at all; it only counts the samples
+
+sink() picks WinSound if winsound exists, else a Pipe to the first
+player that is installed and still running STARTUP seconds after it
+starts, else Null. When the sink fails, the mixer stops and plays
+nothing from then on. WAV files that the wave module cannot decode
+(such as ones holding MP3) are not played."""
+
+import array
+import io
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import wave
+
+try:
+    import winsound
+except ImportError:
+    winsound = None
+
+################################################################################
+
+RATE = 22050                # samples per second
+CHUNK = RATE // 8           # samples mixed and written at a time
+STARTUP = 0.25              # seconds a player has to fail in
+
+PLAYERS = (('aplay', '-q', '-t', 'raw', '-f', 'S16_LE', '-c', '1', '-r', '{rate}'),
+           ('pacat', '--playback', '--format=s16le', '--channels=1', '--rate={rate}'))
+
+_cache = {}
+_mixer = []
+
+################################################################################
+
+class Pipe:
+
+    "Pipe(command) -> Pipe instance"
+
+    __slots__ = ('process',)
+
+    def __init__(self, command):
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                        stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL)
+
+    def alive(self, timeout=0):
+        "Return whether the player is still running after timeout seconds."
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            return True
+        return False
+
+    def write(self, data):
+        "Stream the PCM to the player."
+        self.process.stdin.write(data)
+        self.process.stdin.flush()
+
+class WinSound:
+
+    "WinSound() -> WinSound instance"
+
+    __slots__ = ()
+
+    def write(self, data):
+        "Play the PCM and return when it is done."
+        file = io.BytesIO()
+        with wave.open(file, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(RATE)
+            wav.writeframes(data)
+        winsound.PlaySound(file.getvalue(), winsound.SND_MEMORY)
+
+class Null:
+
+    "Null() -> Null instance"
+
+    __slots__ = ('samples',)
+
+    def __init__(self):
+        self.samples = 0
+
+    def write(self, data):
+        "Count the PCM without playing it."
+        self.samples += len(data) // 2
+
+################################################################################
+
+class Mixer:
+
+    """Mixer(sink) -> Mixer instance
+
+    Once started, the mixer adds the music and the effects together on
+    a thread of its own and writes them to the sink in real time,
+    keeping one chunk ahead. It sleeps while there is nothing to play."""
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.broken = False
+        self.__music = None
+        self.__effects = []
+        self.__condition = threading.Condition()
+
+    def start(self):
+        "Start mixing on a thread of its own and return the mixer."
+        threading.Thread(target=self.__run, daemon=True).start()
+        return self
+
+    def loop(self, samples):
+        "Play the samples over and over in place of any music."
+        with self.__condition:
+            self.__music = [samples, 0] if samples else None
+            self.__condition.notify()
+
+    def play(self, samples):
+        "Play the samples once along with everything else."
+        if samples:
+            with self.__condition:
+                self.__effects.append([samples, 0])
+                self.__condition.notify()
+
+    def busy(self):
+        "Return whether there is anything left to play."
+        with self.__condition:
+            return not self.broken and (self.__music is not None or bool(self.__effects))
+
+    def mix(self):
+        "Return the next chunk of the music and effects added together."
+        total = [0] * CHUNK
+        if self.__music is not None:
+            samples, position = self.__music
+            for index in range(CHUNK):
+                total[index] = samples[position]
+                position += 1
+                if position == len(samples):
+                    position = 0
+            self.__music[1] = position
+        for effect in self.__effects:
+            samples, position = effect
+            part = samples[position:position + CHUNK]
+            for index, sample in enumerate(part):
+                total[index] += sample
+            effect[1] = position + len(part)
+        self.__effects = [effect for effect in self.__effects if effect[1] < len(effect[0])]
+        chunk = array.array('h', (max(-32768, min(32767, sample)) for sample in total))
+        if sys.byteorder != 'little':
+            chunk.byteswap()
+        return chunk.tobytes()
+
+    def __run(self):
+        # Mix a chunk, write it, and wait until the one before it has
+        # been heard; start the clock over after every silence.
+        due = None
+        while True:
+            with self.__condition:
+                while self.__music is None and not self.__effects:
+                    self.__condition.wait()
+                    due = None
+                data = self.mix()
+            try:
+                self.sink.write(data)
+            except (OSError, RuntimeError):
+                with self.__condition:
+                    self.broken = True
+                    self.__music = None
+                    self.__effects = []
+                return
+            now = time.perf_counter()
+            due = now if due is None else due + CHUNK / RATE
+            time.sleep(max(0, due - now))
+
+################################################################################
+
+def sink():
+    "Return the best sink that this system can play sounds with."
+    if winsound is not None:
+        return WinSound()
+    for command in PLAYERS:
+        if shutil.which(command[0]):
+            try:
+                pipe = Pipe([argument.format(rate=RATE) for argument in command])
+            except OSError:
+                break
+            # a player that cannot open a sound device exits at once
+            if pipe.alive(STARTUP):
+                return pipe
+            break
+    return Null()
+
+def mixer():
+    "Return the mixer that sounds are played with."
+    if not _mixer:
+        _mixer.append(Mixer(sink()).start())
+    return _mixer[0]
+
+def load(filename):
+    "Return the samples in the WAV file, decoding it only once."
+    if filename not in _cache:
+        _cache[filename] = _decode(filename)
+    return _cache[filename]
 
 def start(filename):
-    player = Process(target=_play_loop, args=(filename, SND_FILENAME))
-    player.daemon = True
-    player.start()
+    "Loop the WAV file in the background."
+    mixer().loop(load(filename))
+
+def play(filename):
+    "Play the WAV file without waiting for it."
+    mixer().play(load(filename))
+
+################################################################################
 
-def _play_loop(filename, flags):
-    while True:
-        PlaySound(filename, flags)
+def _decode(filename):
+    # Return the WAV file as 16-bit mono samples at RATE (an array),
+    # or None if the wave module cannot read it.
+    try:
+        with wave.open(filename, 'rb') as wav:
+            channels = wav.getnchannels()
+            width = wav.getsampwidth()
+            rate = wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    if width == 1:
+        samples = array.array('h', ((byte - 128) << 8 for byte in frames))
+    elif width == 2:
+        samples = array.array('h', frames)
+        if sys.byteorder != 'little':
+            samples.byteswap()
+    else:
+        return None
+    if channels > 1:
+        samples = array.array('h', (sum(samples[index:index + channels]) // channels
+                                    for index in range(0, len(samples), channels)))
+    if rate != RATE:
+        count = len(samples) * RATE // rate
+        samples = array.array('h', (samples[index * rate // RATE] for index in range(count)))
+    return samples
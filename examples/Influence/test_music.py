@@ -0,0 +1,97 @@
+#! /usr/bin/env python3
+'Tests for the music module.'
+
+################################################################################
+
+import array
+import os
+import time
+import unittest
+from unittest import mock
+
+import music
+
+################################################################################
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def samples(*values):
+    return array.array('h', values)
+
+def chunk(data):
+    return list(array.array('h', data))
+
+def wait(test, seconds=5):
+    'Return whether test() came true within the given seconds.'
+    end = time.perf_counter() + seconds
+    while not test():
+        if time.perf_counter() > end:
+            return False
+        time.sleep(0.01)
+    return True
+
+################################################################################
+
+class MixerTest(unittest.TestCase):
+
+    def test_music_loops(self):
+        mixer = music.Mixer(music.Null())
+        mixer.loop(samples(1, 2, 3))
+        self.assertEqual(chunk(mixer.mix())[:7], [1, 2, 3, 1, 2, 3, 1])
+        self.assertEqual(chunk(mixer.mix())[0], [1, 2, 3][music.CHUNK % 3])
+        self.assertTrue(mixer.busy())
+
+    def test_effects_add_and_end(self):
+        mixer = music.Mixer(music.Null())
+        mixer.loop(samples(100))
+        mixer.play(samples(*[1] * (music.CHUNK + 2)))
+        mixer.play(samples(32767))
+        first, second, third = chunk(mixer.mix()), chunk(mixer.mix()), chunk(mixer.mix())
+        self.assertEqual(first[:2], [32767, 101])
+        self.assertEqual(first[-1], 101)
+        self.assertEqual(second[:3], [101, 101, 100])
+        self.assertEqual(set(third), {100})
+        mixer.loop(None)
+        self.assertFalse(mixer.busy())
+
+    def test_null_counts(self):
+        sink = music.Null()
+        mixer = music.Mixer(sink).start()
+        mixer.play(samples(*[1] * music.CHUNK * 2))
+        self.assertTrue(wait(lambda: sink.samples == music.CHUNK * 2))
+        self.assertFalse(mixer.busy())
+
+    def test_broken_sink(self):
+        class Broken:
+            def write(self, data):
+                raise OSError('broken pipe')
+        mixer = music.Mixer(Broken()).start()
+        mixer.loop(samples(1))
+        self.assertTrue(wait(lambda: mixer.broken))
+        self.assertFalse(mixer.busy())
+        mixer.play(samples(1))
+
+################################################################################
+
+class ModuleTest(unittest.TestCase):
+
+    def test_decode(self):
+        blast = music.load(os.path.join(HERE, 'blast.wav'))
+        self.assertAlmostEqual(len(blast) / music.RATE, 0.571, 3)
+        # the music is MP3 in a WAV file, which wave cannot read
+        self.assertIsNone(music.load(os.path.join(HERE, 'background.wav')))
+
+    def test_no_player(self):
+        with mock.patch.object(music, 'winsound', None), \
+             mock.patch.object(music, 'PLAYERS', (('no such player',),)), \
+             mock.patch.object(music, '_mixer', []):
+            self.assertIsInstance(music.sink(), music.Null)
+            # what Islands does when it starts and when a piece blasts
+            music.start(os.path.join(HERE, 'background.wav'))
+            music.play(os.path.join(HERE, 'blast.wav'))
+            self.assertIsInstance(music.mixer().sink, music.Null)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,15 +3,29 @@
 import tkinter as Tkinter
 import tkinter.messagebox as tkMessageBox
 import tkinter.simpledialog as tkSimpleDialog
+import collections
 import random
 import time
 
 # CUSTOM
-import physics
+import scores
+import simulation
 from opt import *
 
 ################################################################################
 
+# SIMULATION OPTIONS
+
+GRID = True     # Only crash balls that share or neighbor a grid cell.
+NUMPY = False   # Step all balls at once with physics.World arrays.
+                # World ignores GRID and KERNEL and cannot be SWEPT.
+KERNEL = 'dot'  # Collision kernel from physics.KERNELS ('dot', 'angle', or 'vector').
+THREAD = False  # Step the physics on a worker thread instead of with after.
+SWEPT = False   # Crash balls that touch at any time during a physics step.
+STEPS = 4       # Most physics steps per update; any more are dropped.
+
+################################################################################
+
 # PROGRAM INITIALIZATION FUNCTIONS
 
 def main():
@@ -19,6 +33,7 @@ def main():
     global run
     run = False
     initialize()
+    verify_HST()
     show_start()
     run = True
     Tkinter.mainloop()
@@ -57,29 +72,13 @@ def show_start():
 
 def format_HST():
     "Properly format HST into a string."
-    verify_HST()
-    lines = []
-    for key in sorted(HST, reverse=True):
-        score = ' ' + str(key)
-        for name in HST[key]:
-            lines.append((name[:MNU.N_LEN] + ' ').ljust(MNU.HST_W - len(score), STR.T_SPACE) + score)
-    return '\n'.join(lines)
+    return board.format(MNU.HST_W, MNU.N_LEN, STR.T_SPACE)
 
 def verify_HST():
-    "Check the HST data structure."
+    "Check the HST data structure and build the board from it."
+    global board
     try:
-        names = 0
-        for key in HST:
-            assert isinstance(key, int)
-            if isinstance(HST[key], map):
-                HST[key] = list(HST[key])
-            assert isinstance(HST[key], list)
-            for name in HST[key]:
-                assert isinstance(name, str)
-                names += 1
-                assert names <= MNU.HST_H
-        # I have no idea what is causing problems in the next line.
-        # assert names == MNU.HST_H, repr(names) + ' != ' + repr(MNU.HST_H)
+        board = scores.Leaderboard(HST, MNU.HST_H)
     except:
         root.withdraw()
         tkMessageBox.showerror('Error', 'The high score table is corrupt.')
@@ -116,42 +115,39 @@ def start_session(event):
 
 def build_balls():
     "Build some non-overlapping balls."
-    global balls
-    balls = []
-    sides = set()
-    for ball in range(GAM.B_ALL):
-        x = -GAM.B_OFF if random.randint(0, 1) else GAM.B_OFF + GAM.SCR_W
-        y = random.randint(GAM.B_RAD, GAM.SCR_H - GAM.F_OFF - GAM.B_RAD) / GAM.B_RAD * GAM.B_RAD
-        while (x, y) in sides:
-            x = -GAM.B_OFF if random.randint(0, 1) else GAM.B_OFF + GAM.SCR_W
-            y = random.randint(GAM.B_RAD, GAM.SCR_H - GAM.F_OFF - GAM.B_RAD) / GAM.B_RAD * GAM.B_RAD
-        sides.add((x, y))
-        balls.append(physics.Ball(x, y, GAM.B_RAD))
-        balls[-1].type = 0
-    balls = tuple(balls)
+    global balls, session
+    session = simulation.Session(PHY, GAM, TMR, random, GRID, NUMPY, KERNEL, SWEPT)
+    balls = session.build_balls()
 
 def build_world():
     "Build the program's environment."
-    global clock_xy
+    global ovals, fills
     x = GAM.W_OFF - 1
     y = GAM.SCR_H - GAM.F_OFF + 2
     screen.create_rectangle(-1, -1, x, y, fill=CLR.FORCE)
     screen.create_rectangle(GAM.SCR_W - x, -1, GAM.SCR_W, y, fill=CLR.FORCE)
     screen.create_line(0, y, GAM.SCR_W, y, fill=CLR.FLOOR, width=3)
-    clock_xy = x / 2, (y + GAM.SCR_H) / 2
-    screen.create_text(clock_xy, text=f_time(TMR.LIMIT), tag='timer')
+    screen.create_text(x / 2, (y + GAM.SCR_H) / 2, text=f_time(TMR.LIMIT), tag='timer')
+    screen.create_text(GAM.SCR_W - x / 2, (y + GAM.SCR_H) / 2, tag='rate')
+    fills = [ball.type for ball in balls]
+    ovals = [screen.create_oval(0, 0, 0, 0, fill=CLR.CYCLE[ball.type], tag=(num, 'ball')) for num, ball in enumerate(balls)]
     screen.bind('<1>', click)
 
 def build_loops():
     "Build the program's three loops."
-    global world_h, frame_h, clock_h, start, world, frame, clock
-    world_h = screen.after(1000 // TMR.P_FPS, update_world)
-    frame_h = screen.after(1000 // TMR.S_FPS, update_frame)
+    global world_h, frame_h, clock_h, world, frame, clock, drawn, frame_times, runner
+    world = simulation.Scheduler(TMR.P_FPS, STEPS)
+    frame = simulation.Scheduler(TMR.S_FPS, 1)
+    if THREAD:
+        runner = simulation.Runner(session)
+        runner.start()
+    else:
+        world_h = screen.after(world.delay(), update_world)
+    frame_h = screen.after(frame.delay(), update_frame)
     clock_h = screen.after(1000, update_clock)
-    start = time.clock()
-    world = 1.0
-    frame = 1.0
     clock = 0
+    drawn = time.perf_counter()
+    frame_times = collections.deque(maxlen=TMR.S_FPS)
 
 ################################################################################
 
@@ -159,76 +155,45 @@ def build_loops():
 
 def update_world():
     "Crash, move, and mutate the balls."
-    global world_h, world
-    for index, ball_1 in enumerate(balls[:-1]):
-        for ball_2 in balls[index+1:]:
-            ball_1.crash(ball_2)
-    for ball in balls:
-        ball.err *= PHY.B_BONUS
-        ball.correct()
-        governor(ball)
-        ball.move(TMR.P_FPS)
-        for mutate in wall, floor, gravity, friction:
-            mutate(ball)
-    world += 1
-    world_h = screen.after(int((start + world / TMR.P_FPS - time.clock()) * 1000), update_world)
+    global world_h
+    for step in range(world.tick()):
+        session.step()
+    world_h = screen.after(world.delay(), update_world)
 
 def update_frame():
     "Draw the contents of the screen."
-    global frame_h, frame
-    screen.delete('ball')
-    for num, ball in enumerate(balls):
-        x1 = ball.pos.x - ball.rad
-        y1 = ball.pos.y - ball.rad
-        x2 = ball.pos.x + ball.rad
-        y2 = ball.pos.y + ball.rad
-        screen.create_oval(x1, y1, x2, y2, fill=CLR.CYCLE[ball.type], tag=(num, 'ball'))
-    frame += 1
-    frame_h = screen.after(int((start + frame / TMR.S_FPS - time.clock()) * 1000), update_frame)
+    global frame_h, drawn
+    if frame.tick():
+        now = time.perf_counter()
+        frame_times.append(now - drawn)
+        drawn = now
+        for num, (x, y) in enumerate(runner.positions(now) if THREAD else session.positions()):
+            ball = balls[num]
+            screen.coords(ovals[num], x - ball.rad, y - ball.rad, x + ball.rad, y + ball.rad)
+            if fills[num] != ball.type:
+                fills[num] = ball.type
+                screen.itemconfig(ovals[num], fill=CLR.CYCLE[ball.type])
+    frame_h = screen.after(frame.delay(), update_frame)
+
+def stop_world():
+    "Stop stepping the balls."
+    if THREAD:
+        runner.stop()
+    else:
+        screen.after_cancel(world_h)
 
 def update_clock():
     "Update the clock on the screen."
     global clock_h, clock
-    screen.delete('timer')
-    clock += 1
-    screen.create_text(clock_xy, text=f_time(TMR.LIMIT - clock), tag='timer')
-    if TMR.LIMIT - clock:
-        clock_h = screen.after(int((start + clock + 1 - time.clock()) * 1000), update_clock)
-    else:
-        lose(True)
-
-################################################################################
-
-# VELOCITY MUTATOR FUNCTIONS
-
-def governor(ball):
-    "Simulate speed governor."
-    if abs(ball.vel) > PHY.S_LIMIT:
-        ball.vel = ball.vel.unit() * PHY.S_LIMIT
-
-def wall(ball):
-    "Simulate a force-field wall."
-    space = GAM.W_OFF + ball.rad
-    force = float(PHY.W_FORCE) / TMR.P_FPS
-    if ball.pos.x <= space:
-        ball.vel.x += force
-    elif ball.pos.x >= GAM.SCR_W - space:
-        ball.vel.x -= force
-
-def floor(ball):
-    "Simulate a floor."
-    floor_height = GAM.SCR_H - GAM.F_OFF - ball.rad
-    if ball.pos.y >= floor_height:
-        ball.pos.y = floor_height
-        ball.vel.y *= -1
-
-def gravity(ball):
-    "Simulate gravity."
-    ball.vel.y += float(PHY.G_FORCE) / TMR.P_FPS
-
-def friction(ball):
-    "Simulate friction."
-    ball.vel *= (PHY.F_FORCE / 1000.0) ** (1.0 / TMR.P_FPS)
+    played = (runner.steps if THREAD else world.steps) / TMR.P_FPS
+    if played >= clock + 1:
+        clock += 1
+        screen.itemconfig('timer', text=f_time(TMR.LIMIT - clock))
+        screen.itemconfig('rate', text=f_rate(frame_times))
+        if not TMR.LIMIT - clock:
+            lose(True)
+            return
+    clock_h = screen.after(max(int((clock + 1 - played) * 1000) + 1, 1), update_clock)
 
 ################################################################################
 
@@ -241,13 +206,13 @@ def click(event):
         ball = balls[int(screen.gettags(screen.find_withtag(Tkinter.CURRENT))[0])]
         ball.type = (ball.type + 1) % len(CLR.CYCLE)
         if sum(map(lambda ball: ball.type, balls)) == (len(CLR.CYCLE) - 1) * len(balls):
-            screen.after_cancel(world_h)
+            stop_world()
             screen.after_cancel(frame_h)
             screen.after_cancel(clock_h)
             screen.delete('ball')
             blink = screen.create_text(GAM.SCR_W / 2, GAM.SCR_H / 2, text=STR.MS_TEXT, font=FNT.MS_TEXT, fill=CLR.MS_TEXT)
             blink_h = screen.after(TMR.MS_FF, toggle_text)
-            screen.after(TMR.DELAY, win if TMR.LIMIT - clock >= min(HST) else lose)
+            screen.after(TMR.DELAY, win if TMR.LIMIT - clock >= board.lowest() else lose)
     except:
         pass
 
@@ -260,16 +225,8 @@ def toggle_text():
 def win():
     "Add name to HST and return to menu."
     name = tkSimpleDialog.askstring(STR.VICT_TI, '\n'.join(STR.VICT_MS)) or STR.DEFAULT
-    score = TMR.LIMIT - clock
-    if score in HST:
-        HST[score].insert(0, name)
-    else:
-        HST[score] = [name]
-    loser = min(HST)
-    if len(HST[loser]) > 1:
-        del HST[loser][-1]
-    else:
-        del HST[loser]
+    board.insert(TMR.LIMIT - clock, name)
+    board.save(HST)
     screen.after_cancel(blink_h)
     show_start()
 
@@ -281,11 +238,15 @@ def f_time(seconds):
     "Return time with correct format."
     return '%02d:%02d' % (seconds / 60, seconds % 60)
 
+def f_rate(frame_times):
+    "Return the frame rate from recent frame times."
+    return '%d FPS' % round(len(frame_times) / sum(frame_times)) if sum(frame_times) else ''
+
 def lose(real=False):
     "End the session and get input."
     restart = tkMessageBox.askquestion(STR.LOSE_TI, STR.LOSE_MS) == 'yes'
     if real:
-        screen.after_cancel(world_h)
+        stop_world()
         screen.after_cancel(frame_h)
     else:
         screen.after_cancel(blink_h)
@@ -0,0 +1,172 @@
+#! /usr/bin/env python3
+'''Module for headless Kaos Rain runs.
+
+This module steps a session without Tk at the fixed physics rate,
+seeding the random number generator so that runs can be replayed.
+It reports the step rate, the time spent crashing balls versus
+moving them, and a hash of the final state of every ball.'''
+
+################################################################################
+
+import argparse as _argparse
+import hashlib as _hashlib
+import math as _math
+import random as _random
+import struct as _struct
+import sys as _sys
+import time as _time
+import types as _types
+
+import defaults as _defaults
+import physics as _physics
+import simulation as _simulation
+
+################################################################################
+
+class Report:
+
+    'Report(balls, steps, collide, integrate, digest) -> Report'
+
+    def __init__(self, balls, steps, collide, integrate, digest):
+        'Initialize the Report object.'
+        self.balls = balls
+        self.steps = steps
+        self.collide = collide
+        self.integrate = integrate
+        self.digest = digest
+
+    def __str__(self):
+        'Return the report as text.'
+        total = self.collide + self.integrate
+        return '\n'.join(('%d balls x %d steps' % (self.balls, self.steps),
+                          'steps/sec: %.1f' % (self.steps / total if total else float('inf')),
+                          'collision: %.3f s (%.1f%%)' % (self.collide, 100 * self.collide / total if total else 0),
+                          'integration: %.3f s (%.1f%%)' % (self.integrate, 100 * self.integrate / total if total else 0),
+                          'state: %s' % self.digest))
+
+################################################################################
+
+def settings(**changes):
+    'Return PHY, GAM, and TMR with the given names changed.'
+    groups = []
+    for name in 'PHY', 'GAM', 'TMR':
+        group = dict(getattr(_defaults, name))
+        for key in list(changes):
+            if key in group:
+                group[key] = changes.pop(key)
+        groups.append(_types.SimpleNamespace(**group))
+    if changes:
+        raise KeyError('Unknown settings: %s' % ', '.join(sorted(changes)))
+    return groups
+
+def run(balls, steps, seed=0, grid=True, numpy=False, kernel='dot', swept=False, **changes):
+    'Run a session and return its Report.'
+    PHY, GAM, TMR = settings(B_ALL=balls, **changes)
+    session = _simulation.Session(PHY, GAM, TMR, _random.Random(seed), grid, numpy, kernel, swept)
+    session.build_balls()
+    clock = _time.perf_counter
+    collide = integrate = 0.0
+    for step in range(steps):
+        start = clock()
+        session.collide()
+        middle = clock()
+        session.integrate()
+        collide += middle - start
+        integrate += clock() - middle
+    session.store()
+    return Report(balls, steps, collide, integrate, digest(session.balls))
+
+def touching(pairs, seed=0):
+    'Return random pairs of touching balls with random velocities.'
+    rng = _random.Random(seed)
+    balls = []
+    for pair in range(pairs):
+        ball_1 = _physics.Ball(rng.uniform(0, 450), rng.uniform(0, 450), rng.uniform(5, 25))
+        ball_2 = _physics.Ball(rng.uniform(0, 450), rng.uniform(0, 450), rng.uniform(5, 25))
+        angle = rng.uniform(0, 2 * _math.pi)
+        reach = rng.uniform(0.01, 1) * (ball_1.rad + ball_2.rad)
+        ball_2.pos.set(ball_1.pos.x + reach * _math.cos(angle), ball_1.pos.y + reach * _math.sin(angle))
+        for ball in ball_1, ball_2:
+            ball.vel.set(rng.uniform(-750, 750), rng.uniform(-750, 750))
+        balls.append((ball_1, ball_2))
+    return balls
+
+def compare_kernels(pairs=100000, seed=0, tolerance=1e-9):
+    'Return the pairs on which the dot and angle kernels disagree.'
+    differ = []
+    for ball_1, ball_2 in touching(pairs, seed):
+        errors = []
+        for kernel in _physics.KERNELS['dot'], _physics.KERNELS['angle']:
+            ball_1.err.set(0.0, 0.0)
+            ball_2.err.set(0.0, 0.0)
+            kernel(ball_1, ball_2)
+            errors.append((ball_1.err.x, ball_1.err.y, ball_2.err.x, ball_2.err.y))
+        scale = max(1.0, max(map(abs, errors[1])))
+        if max(abs(dot - angle) for dot, angle in zip(*errors)) > tolerance * scale:
+            differ.append((ball_1, ball_2))
+    return differ
+
+def crash_benchmark(pairs=100000, seed=0, kernel='dot'):
+    'Return the Vectors allocated and seconds spent per crashing pair.'
+    balls = touching(pairs, seed)
+    crash = _physics.KERNELS[kernel]
+    created = [0]
+    init = _physics.Vector.__init__
+    def counter(self, x, y):
+        created[0] += 1
+        init(self, x, y)
+    _physics.Vector.__init__ = counter
+    try:
+        start = _time.perf_counter()
+        for ball_1, ball_2 in balls:
+            crash(ball_1, ball_2)
+        seconds = _time.perf_counter() - start
+    finally:
+        _physics.Vector.__init__ = init
+    return created[0] / pairs, seconds / pairs
+
+def digest(balls):
+    'Return a hash of the position and velocity of every ball.'
+    state = _hashlib.sha1()
+    for ball in balls:
+        state.update(_struct.pack('<4d', ball.pos.x, ball.pos.y, ball.vel.x, ball.vel.y))
+    return state.hexdigest()
+
+################################################################################
+
+def main(argv=None):
+    'Run a session from the command line.'
+    parser = _argparse.ArgumentParser(description='Step Kaos Rain without Tk.')
+    parser.add_argument('-n', '--balls', type=int, default=_defaults.GAM['B_ALL'], help='number of balls')
+    parser.add_argument('-m', '--steps', type=int, default=600, help='number of physics steps')
+    parser.add_argument('-s', '--seed', type=int, default=0, help='random seed for placing the balls')
+    parser.add_argument('--fps', type=int, default=_defaults.TMR['P_FPS'], help='physics steps per second')
+    parser.add_argument('--pairs', action='store_true', help='crash every pair instead of using the grid')
+    parser.add_argument('--numpy', action='store_true', help='step the balls with physics.World')
+    parser.add_argument('--kernel', choices=sorted(_physics.KERNELS), default='dot', help='collision kernel for Ball')
+    parser.add_argument('--swept', action='store_true', help='crash balls that touch at any time in a step')
+    parser.add_argument('--expect', metavar='HASH', help='exit with an error unless the state matches')
+    parser.add_argument('--crash', action='store_true', help='measure the kernel on touching pairs instead')
+    parser.add_argument('--compare', action='store_true', help='check that the kernels agree on random pairs')
+    args = parser.parse_args(argv)
+    if args.numpy and args.swept:
+        parser.error('--numpy and --swept cannot be combined')
+    if args.crash:
+        vectors, seconds = crash_benchmark(seed=args.seed, kernel=args.kernel)
+        print('%s kernel: %.2f Vectors and %.3f us per pair' % (args.kernel, vectors, seconds * 1e6))
+        return 0
+    if args.compare:
+        differ = compare_kernels(seed=args.seed)
+        print('kernels differ on %d pairs' % len(differ))
+        return 1 if differ else 0
+    report = run(args.balls, args.steps, args.seed, not args.pairs, args.numpy, args.kernel, args.swept, P_FPS=args.fps)
+    print(report)
+    if args.expect and args.expect != report.digest:
+        print('expected state: %s' % args.expect, file=_sys.stderr)
+        return 1
+    return 0
+
+################################################################################
+
+if __name__ == '__main__':
+    _sys.exit(main())
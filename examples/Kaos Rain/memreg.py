@@ -0,0 +1,232 @@
+#! /usr/bin/env python3
+'''Module for an in-memory registry.
+
+This module provides the subset of the winreg API used by winreg2
+on top of a hive kept in memory, so winreg2 (and everything built
+on it) also runs where the Windows Registry does not exist. Every
+key is found through one dictionary indexed by its full path, and
+the hive can be attached to a file that is loaded at once and
+saved when the program exits.'''
+
+################################################################################
+
+import atexit as _atexit
+import os as _os
+import pickle as _pickle
+import time as _time
+
+################################################################################
+
+HKEY_CLASSES_ROOT = -2147483648
+HKEY_CURRENT_USER = -2147483647
+HKEY_LOCAL_MACHINE = -2147483646
+HKEY_USERS = -2147483645
+HKEY_CURRENT_CONFIG = -2147483643
+
+KEY_READ = 131097
+KEY_ALL_ACCESS = 983103
+
+REG_SZ = 1
+
+################################################################################
+
+class _Node:
+
+    '_Node(name) -> _Node'
+
+    __slots__ = 'name', 'keys', 'values', 'modified'
+
+    def __init__(self, name):
+        'Initialize the _Node object.'
+        self.name = name
+        self.keys = {}      # lowercase name -> name
+        self.values = {}    # lowercase name -> (name, data, type)
+        self.touch()
+
+    def touch(self):
+        'Record the time of a change.'
+        self.modified = int((_time.time() + 11644473600.0) * 10000000)
+
+################################################################################
+
+class HKEYType:
+
+    'HKEYType(path) -> HKEYType'
+
+    __slots__ = 'path',
+
+    def __init__(self, path):
+        'Initialize the HKEYType object.'
+        self.path = path
+
+    def __repr__(self):
+        'Return the object\'s representation.'
+        return '<memreg.HKEYType %s>' % '\\'.join(map(str, self.path))
+
+    def Close(self):
+        'Close the handle (nothing to release).'
+
+################################################################################
+
+# The hive: every key is indexed by a tuple of the hive constant and the
+# lowercase names on its path, so looking up a key never walks the tree.
+
+_index = {}
+_attached = []
+
+def clear():
+    'Empty the hive, keeping the predefined keys.'
+    _index.clear()
+    for hive in HKEY_CLASSES_ROOT, HKEY_CURRENT_USER, HKEY_LOCAL_MACHINE, HKEY_USERS, HKEY_CURRENT_CONFIG:
+        _index[(hive,)] = _Node(str(hive))
+
+clear()
+
+################################################################################
+
+def _path(key, sub_key=None):
+    'Return the lowercase path of key and sub_key.'
+    path = (key,) if isinstance(key, int) else key.path
+    if sub_key:
+        path += tuple(name.lower() for name in sub_key.split('\\') if name)
+    return path
+
+def _node(path):
+    'Return the node on path or raise FileNotFoundError.'
+    try:
+        return _index[path]
+    except KeyError:
+        raise FileNotFoundError(2, 'The system cannot find the file specified')
+
+def OpenKey(key, sub_key, reserved=0, access=KEY_READ):
+    'Open the specified key.'
+    path = _path(key, sub_key)
+    _node(path)
+    return HKEYType(path)
+
+OpenKeyEx = OpenKey
+
+def CreateKey(key, sub_key):
+    'Create or open the specified key.'
+    path = _path(key, None)
+    node = _node(path)
+    for name in (sub_key or '').split('\\'):
+        if name:
+            path += name.lower(),
+            if path not in _index:
+                node.keys[name.lower()] = name
+                node.touch()
+                _index[path] = _Node(name)
+            node = _index[path]
+    return HKEYType(path)
+
+def DeleteKey(key, sub_key):
+    'Delete a key that has no subkeys.'
+    path = _path(key, sub_key)
+    if len(path) < 2:
+        raise PermissionError(5, 'Access is denied')
+    if _node(path).keys:
+        raise PermissionError(5, 'Access is denied')
+    del _index[path]
+    parent = _index[path[:-1]]
+    del parent.keys[path[-1]]
+    parent.touch()
+
+def EnumKey(key, index):
+    'Return the name of the subkey at index.'
+    names = list(_node(_path(key)).keys.values())
+    if not 0 <= index < len(names):
+        raise OSError(259, 'No more data is available')
+    return names[index]
+
+def EnumValue(key, index):
+    'Return (name, data, type) of the value at index.'
+    values = list(_node(_path(key)).values.values())
+    if not 0 <= index < len(values):
+        raise OSError(259, 'No more data is available')
+    return values[index]
+
+def QueryInfoKey(key):
+    'Return (subkeys, values, modified) of the key.'
+    node = _node(_path(key))
+    return len(node.keys), len(node.values), node.modified
+
+def QueryValueEx(key, value_name):
+    'Return (data, type) of the named value.'
+    try:
+        name, data, kind = _node(_path(key)).values[(value_name or '').lower()]
+    except KeyError:
+        raise FileNotFoundError(2, 'The system cannot find the file specified')
+    return data, kind
+
+def QueryValue(key, sub_key):
+    'Return the default value of the subkey.'
+    node = _node(_path(key, sub_key))
+    return node.values.get('', ('', '', REG_SZ))[1]
+
+def SetValueEx(key, value_name, reserved, type, value):
+    'Store data in the named value.'
+    node = _node(_path(key))
+    node.values[(value_name or '').lower()] = value_name or '', value, type
+    node.touch()
+
+def SetValue(key, sub_key, type, value):
+    'Store a string as the default value of the subkey.'
+    SetValueEx(CreateKey(key, sub_key), '', 0, REG_SZ, value)
+
+def DeleteValue(key, value):
+    'Remove the named value.'
+    node = _node(_path(key))
+    try:
+        del node.values[(value or '').lower()]
+    except KeyError:
+        raise FileNotFoundError(2, 'The system cannot find the file specified')
+    node.touch()
+
+def ConnectRegistry(computer_name, key):
+    'Return the predefined key (only the local hive exists).'
+    if computer_name:
+        raise OSError(53, 'The network path was not found')
+    return OpenKey(key, None)
+
+def CloseKey(hkey):
+    'Close the handle (nothing to release).'
+
+################################################################################
+
+def SaveKey(key, file_name):
+    'Save the key and all of its subkeys to file_name.'
+    path = _path(key)
+    tree = dict((other[len(path):], node) for other, node in _index.items() if other[:len(path)] == path)
+    with open(file_name, 'wb') as file:
+        _pickle.dump(tree, file, _pickle.HIGHEST_PROTOCOL)
+
+def LoadKey(key, sub_key, file_name):
+    'Load the keys in file_name under the subkey.'
+    path = _path(CreateKey(key, sub_key))
+    with open(file_name, 'rb') as file:
+        tree = _pickle.load(file)
+    for other in [other for other in _index if other[:len(path)] == path]:
+        del _index[other]
+    tree[()].name = _index[path[:-1]].keys[path[-1]]
+    for relative, node in tree.items():
+        _index[path + relative] = node
+
+################################################################################
+
+def attach(file_name):
+    'Keep the whole hive in file_name (loaded now and saved at exit).'
+    if _os.path.exists(file_name):
+        with open(file_name, 'rb') as file:
+            _index.clear()
+            _index.update(_pickle.load(file))
+    if not _attached:
+        _atexit.register(flush)
+    _attached[:] = [file_name]
+
+def flush():
+    'Save the hive to the attached file.'
+    if _attached:
+        with open(_attached[0] + '.tmp', 'wb') as file:
+            _pickle.dump(_index, file, _pickle.HIGHEST_PROTOCOL)
+        _os.replace(_attached[0] + '.tmp', _attached[0])
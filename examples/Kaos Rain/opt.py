@@ -1,81 +1,139 @@
 #! /usr/bin/env python3
+import atexit as _atexit
+import copy as _copy
 import tkinter as _TK
 import tkinter.messagebox as _MB
-import winreg2 as _wi
-import install as _in
+import defaults as _de
+import storage as _st
 
 ################################################################################
 
 class _Virtual:
 
-    '_Virtual(key) -> _Virtual'
+    '_Virtual(store, section, check) -> _Virtual'
 
-    def __init__(self, key):
+    def __init__(self, store, section, check):
         'Initialize the _Virtual object.'
-        self.__map = {}
-        self.__key = key
-        for value in key.values:
-            if value.isupper():
-                data = _unpack(key.values[value])
-                self[value] = data
-                setattr(self, value, data)
-            elif value.isdigit():
-                self[int(value)] = _unpack(key.values[value])
+        self.__store = store
+        self.__section = section
+        self.__check = check
+        self.__map = None
+        self.__saved = {}
+        self.__dirty = set()
+
+    def __getattr__(self, name):
+        'Return an uppercase value from the section.'
+        if not name.isupper():
+            raise AttributeError(name)
+        try:
+            return self.__load()[name]
+        except KeyError:
+            raise AttributeError(name)
 
     def __delitem__(self, name):
-        return self.__map.__delitem__(name)
+        self.__dirty.add(name)
+        self.__load().__delitem__(name)
+        if name in self.__dict__:
+            delattr(self, name)
 
     def __getitem__(self, name):
-        return self.__map.__getitem__(name)
+        return self.__load().__getitem__(name)
 
     def __setitem__(self, name, value):
-        return self.__map.__setitem__(name, value)
+        self.__dirty.add(name)
+        self.__load().__setitem__(name, value)
+        if isinstance(name, str) and name.isupper():
+            setattr(self, name, value)
+
+    def __contains__(self, name):
+        return self.__load().__contains__(name)
 
-    def __del__(self):
-        'Update the registry.'
-        del self.__key.values
-        for value in self:
-            self.__key.values[str(value)] = self.__pack(self[value])
+    def __len__(self):
+        return self.__load().__len__()
 
     def __iter__(self):
         'Iterate over the values in self.'
-        return iter(filter(lambda value: isinstance(value, int) or isinstance(value, str) and value.isupper(), self.__map.keys()))
+        return iter(list(self.__load()))
 
-    __pack = staticmethod(_in.solve)
+    def changes(self):
+        'Return the changed values and the deleted names.'
+        if self.__map is None:
+            return {}, set()
+        dirty = self.__dirty.union(name for name in self.__map if self.__map[name] != self.__saved.get(name))
+        changed = dict((str(name), self.__map[name]) for name in dirty if name in self.__map)
+        deleted = set(str(name) for name in dirty if name not in self.__map)
+        return changed, deleted
 
-################################################################################
+    def saved(self):
+        'Mark the current values as saved.'
+        self.__saved = _copy.deepcopy(self.__map)
+        self.__dirty.clear()
 
-def _unpack(value):
-    'Correctly unpack the value.'
-    if isinstance(value, _wi.REG_SZ):
-        return str(value.value)
-    elif isinstance(value, _wi.REG_DWORD):
-        return int(value.value)
-    elif isinstance(value, _wi.REG_MULTI_SZ):
-        return list(map(str, value.value))
-    raise NotImplementedError('Cannot solve for %s' % type(value))
+    def __load(self):
+        'Private class method.'
+        if self.__map is None:
+            values = {}
+            for name, data in self.__store.load(self.__section).items():
+                if name.isupper():
+                    values[name] = data
+                elif name.isdigit():
+                    values[int(name)] = data
+            self.__check(self.__section, values)
+            self.__map = values
+            self.saved()
+            # Plain attributes skip __getattr__ on later reads.
+            for name, data in values.items():
+                if isinstance(name, str):
+                    setattr(self, name, data)
+        return self.__map
+
+################################################################################
 
 def _export(key, ignore):
-    'Export all subkeys in key to globals.'
+    'Export all sections in key to globals.'
+    global _store, _ignore
     try:
+        _store = _st.default(key)
+        _ignore = ignore
         GLOBAL = globals()
-        root = _wi.Key(_wi.HKEY.CURRENT_USER, key)
-        for key in root.keys:
-            GLOBAL[key] = obj = _Virtual(_wi.Key(root, key, _wi.KEY.ALL_ACCESS))
-            attr = getattr(_in, key)
-            delattr(_in, key)
-            if key not in ignore:
-                for key in obj:
-                    if isinstance(obj[key], map):
-                        obj[key] = list(obj[key])
-                    assert type(obj[key]) == type(attr[key]), repr(type(obj[key])) + ' != ' + repr(type(attr[key]))
-                    del attr[key]
-                assert not attr
-        assert not sum(map(lambda name: name.isupper(), dir(_in)))
+        names = _store.sections()
+        for name in names:
+            GLOBAL[name] = _Virtual(_store, name, _check)
+        assert sorted(names) == sorted(filter(str.isupper, dir(_de)))
     except:
-        _TK.Tk().withdraw()
-        _MB.showerror('Error', 'Please install this program first.')
-        raise SystemExit(1)
+        _fail()
+    _atexit.register(_save)
+
+def _check(name, values):
+    'Compare the section to its defaults.'
+    try:
+        if name not in _ignore:
+            attr = dict(getattr(_de, name))
+            for key in values:
+                assert type(values[key]) == type(attr[key]), repr(type(values[key])) + ' != ' + repr(type(attr[key]))
+                del attr[key]
+            assert not attr
+    except:
+        _fail()
+
+def _save():
+    'Save all changed values in one batch.'
+    changes = {}
+    sections = dict((name, value) for name, value in globals().items() if isinstance(value, _Virtual))
+    for name in sections:
+        changed, deleted = sections[name].changes()
+        if changed or deleted:
+            changes[name] = changed, deleted
+    if changes:
+        _store.save(changes)
+        for name in changes:
+            sections[name].saved()
+
+def _fail():
+    'Tell the user to install the program.'
+    _TK.Tk().withdraw()
+    _MB.showerror('Error', 'Please install this program first.')
+    raise SystemExit(1)
 
 ################################################################################
 
@@ -0,0 +1,106 @@
+#! /usr/bin/env python3
+'''Module for high score tables.
+
+This module provides a bounded table of names ordered by score.
+The distinct scores are kept in a heap with the lowest on top,
+so inserting a new score or evicting the lowest one is O(log n),
+and the table is only sorted when it is formatted; the formatted
+table is cached until the next change. Tables load from and save
+to the {score: [name, ...]} mapping (newest name first) that the
+settings store keeps as HST.'''
+
+################################################################################
+
+import collections as _collections
+import heapq as _heapq
+
+################################################################################
+
+class Leaderboard:
+
+    'Leaderboard(table, size) -> Leaderboard'
+
+    def __init__(self, table, size):
+        'Initialize the Leaderboard object.'
+        self.size = size
+        self.__keys = []        # heap of scores, the lowest first
+        self.__names = {}       # score -> names, newest first
+        self.__count = 0
+        self.__text = None
+        self.__changed = set()
+        for score in table:
+            names = table[score]
+            if not isinstance(score, int) or not isinstance(names, list):
+                raise ValueError('%r: %r is not a score and a list' % (score, names))
+            for name in reversed(names):
+                if not isinstance(name, str):
+                    raise ValueError('%r is not a name' % (name,))
+                self.__add(score, name)
+            if self.__count > size:
+                raise ValueError('more than %d names' % size)
+        self.__changed.clear()
+
+    def __len__(self):
+        'Return the number of names.'
+        return self.__count
+
+    def __iter__(self):
+        'Iterate over (score, name) from the highest score.'
+        for score in sorted(self.__names, reverse=True):
+            for name in self.__names[score]:
+                yield score, name
+
+    def lowest(self):
+        'Return the lowest score in the table.'
+        return self.__keys[0]
+
+    def insert(self, score, name):
+        'Add the name and return the (score, name) pairs evicted.'
+        self.__add(score, name)
+        evicted = []
+        while self.__count > self.size:
+            evicted.append(self.__pop())
+        return evicted
+
+    def format(self, width, length, spacer):
+        'Return the table as lines of names, spacers, and scores.'
+        if self.__text is None or self.__text[0] != (width, length, spacer):
+            lines = []
+            for score, name in self:
+                score = ' ' + str(score)
+                lines.append((name[:length] + ' ').ljust(width - len(score), spacer) + score)
+            self.__text = (width, length, spacer), '\n'.join(lines)
+        return self.__text[1]
+
+    def save(self, table):
+        'Write the scores that changed since the last save into table.'
+        for score in self.__changed:
+            if score in self.__names:
+                table[score] = list(self.__names[score])
+            elif score in table:
+                del table[score]
+        self.__changed.clear()
+
+    def __add(self, score, name):
+        'Private class method.'
+        if score in self.__names:
+            self.__names[score].appendleft(name)
+        else:
+            _heapq.heappush(self.__keys, score)
+            self.__names[score] = _collections.deque((name,))
+        self.__count += 1
+        self.__changed.add(score)
+        self.__text = None
+
+    def __pop(self):
+        'Private class method.'
+        score = self.__keys[0]
+        names = self.__names[score]
+        name = names.pop()
+        if not names:
+            del self.__names[score]
+            _heapq.heappop(self.__keys)
+        self.__count -= 1
+        self.__changed.add(score)
+        self.__text = None
+        return score, name
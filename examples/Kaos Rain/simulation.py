@@ -0,0 +1,273 @@
+#! /usr/bin/env python3
+'''Module for Kaos Rain sessions.
+
+This module provides the rules of a session (placing the balls
+and mutating their velocities) without any use of Tk, so that a
+session can be stepped by the game or by a headless runner, and
+a runner that steps a session on its own thread.'''
+
+################################################################################
+
+import random as _random
+import threading as _threading
+import time as _time
+import physics as _physics
+
+################################################################################
+
+class Session:
+
+    '''Session(PHY, GAM, TMR[, rng][, grid][, numpy][, kernel][, swept]) -> Session
+
+    PHY, GAM, and TMR are the settings objects exported by opt
+    (any object with the same attributes will do). Every step
+    of the session lasts exactly 1 / TMR.P_FPS seconds. The
+    kernel names one of the collision kernels in physics.KERNELS.
+    A swept session crashes balls that will touch at any time
+    during the step and bounces balls off the floor where they
+    cross it, so fast balls cannot pass through either one at a
+    low TMR.P_FPS. Swept sessions ignore the kernel. A numpy
+    session steps the balls with physics.World, which tests
+    every pair with the dot kernel's rule, so it ignores grid
+    and kernel; it has no swept test, and asking for both
+    numpy and swept raises ValueError.'''
+
+    def __init__(self, PHY, GAM, TMR, rng=_random, grid=True, numpy=False, kernel='dot', swept=False):
+        'Initialize the Session object.'
+        if numpy and swept:
+            raise ValueError('physics.World cannot crash swept balls')
+        self.PHY = PHY
+        self.GAM = GAM
+        self.TMR = TMR
+        self.rng = rng
+        self.grid = grid
+        self.numpy = numpy
+        self.crash = _physics.KERNELS[kernel]
+        self.swept = swept
+        self.balls = ()
+
+    def build_balls(self):
+        'Build some non-overlapping balls.'
+        GAM, rng = self.GAM, self.rng
+        if GAM.B_ALL > 2 * (GAM.SCR_H - GAM.F_OFF - 2 * GAM.B_RAD + 1):
+            raise ValueError('%d balls do not fit on the screen' % GAM.B_ALL)
+        balls = []
+        sides = set()
+        for ball in range(GAM.B_ALL):
+            x = -GAM.B_OFF if rng.randint(0, 1) else GAM.B_OFF + GAM.SCR_W
+            y = rng.randint(GAM.B_RAD, GAM.SCR_H - GAM.F_OFF - GAM.B_RAD) / GAM.B_RAD * GAM.B_RAD
+            while (x, y) in sides:
+                x = -GAM.B_OFF if rng.randint(0, 1) else GAM.B_OFF + GAM.SCR_W
+                y = rng.randint(GAM.B_RAD, GAM.SCR_H - GAM.F_OFF - GAM.B_RAD) / GAM.B_RAD * GAM.B_RAD
+            sides.add((x, y))
+            balls.append(_physics.Ball(x, y, GAM.B_RAD))
+            balls[-1].type = 0
+        self.balls = tuple(balls)
+        if self.swept:
+            PHY, TMR = self.PHY, self.TMR
+            travel = (PHY.S_LIMIT + float(PHY.W_FORCE + PHY.G_FORCE) / TMR.P_FPS) / TMR.P_FPS
+            self.__grid = _physics.Grid(GAM.B_RAD + travel)
+        else:
+            self.__grid = _physics.Grid(GAM.B_RAD)
+        if self.numpy:
+            PHY = self.PHY
+            self.__world = _physics.World(self.balls, GAM.SCR_W, GAM.SCR_H, GAM.W_OFF, GAM.F_OFF,
+                                          PHY.S_LIMIT, PHY.W_FORCE, PHY.G_FORCE, PHY.F_FORCE, PHY.B_BONUS)
+        return self.balls
+
+    def step(self):
+        'Crash, move, and mutate the balls.'
+        self.collide()
+        self.integrate()
+
+    def collide(self):
+        'Crash the balls together.'
+        if self.numpy:
+            self.__world.crash()
+        elif self.swept:
+            seconds = 1.0 / self.TMR.P_FPS
+            for ball_1, ball_2 in self.__grid.pairs(self.balls) if self.grid else _physics.pairs(self.balls):
+                ball_1.crash_swept(ball_2, seconds)
+        else:
+            crash = self.crash
+            for ball_1, ball_2 in self.__grid.pairs(self.balls) if self.grid else _physics.pairs(self.balls):
+                crash(ball_1, ball_2)
+
+    def integrate(self):
+        'Move and mutate the balls.'
+        if self.numpy:
+            self.__world.integrate(1.0 / self.TMR.P_FPS)
+        else:
+            for ball in self.balls:
+                ball.err *= self.PHY.B_BONUS
+                ball.correct()
+                self.governor(ball)
+                ball.move(self.TMR.P_FPS)
+                for mutate in self.wall, self.floor, self.gravity, self.friction:
+                    mutate(ball)
+
+    def store(self):
+        'Bring the Ball objects up to date.'
+        if self.numpy:
+            self.__world.store()
+
+    def positions(self):
+        'Return a list with the (x, y) position of every ball.'
+        if self.numpy:
+            return [tuple(pos) for pos in self.__world.pos.tolist()]
+        return [(ball.pos.x, ball.pos.y) for ball in self.balls]
+
+    ########################################################################
+
+    # VELOCITY MUTATOR METHODS
+
+    def governor(self, ball):
+        'Simulate speed governor.'
+        speed = abs(ball.vel)
+        if speed > self.PHY.S_LIMIT:
+            ball.vel *= self.PHY.S_LIMIT / speed
+
+    def wall(self, ball):
+        'Simulate a force-field wall.'
+        space = self.GAM.W_OFF + ball.rad
+        force = float(self.PHY.W_FORCE) / self.TMR.P_FPS
+        if ball.pos.x <= space:
+            ball.vel.x += force
+        elif ball.pos.x >= self.GAM.SCR_W - space:
+            ball.vel.x -= force
+
+    def floor(self, ball):
+        'Simulate a floor.'
+        floor_height = self.GAM.SCR_H - self.GAM.F_OFF - ball.rad
+        if ball.pos.y >= floor_height:
+            if self.swept:
+                ball.pos.y = 2 * floor_height - ball.pos.y
+            else:
+                ball.pos.y = floor_height
+            ball.vel.y *= -1
+
+    def gravity(self, ball):
+        'Simulate gravity.'
+        ball.vel.y += float(self.PHY.G_FORCE) / self.TMR.P_FPS
+
+    def friction(self, ball):
+        'Simulate friction.'
+        ball.vel *= (self.PHY.F_FORCE / 1000.0) ** (1.0 / self.TMR.P_FPS)
+
+################################################################################
+
+class Runner:
+
+    '''Runner(session) -> Runner
+
+    The runner steps the session on a worker thread at TMR.P_FPS
+    and publishes a snapshot of the positions after every step.
+    The last two snapshots are kept in one tuple that is replaced
+    as a whole, so readers never block and never see a torn pair.
+    If the worker falls behind, it runs the missed steps late but
+    never skips one, so the session stays deterministic.'''
+
+    def __init__(self, session):
+        'Initialize the Runner object.'
+        self.session = session
+        self.steps = 0
+        self.__dt = 1.0 / session.TMR.P_FPS
+        self.__start = _time.perf_counter()
+        first = self.__start, session.positions()
+        self.__snapshots = first, first
+        self.__running = False
+        self.__thread = None
+
+    def start(self):
+        'Start stepping the session.'
+        self.__running = True
+        self.__start = _time.perf_counter()
+        self.__thread = _threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        'Stop stepping the session and wait for the current step to end.'
+        self.__running = False
+        if self.__thread is not None:
+            # the worker shares physics' scratch vectors with any new runner
+            self.__thread.join()
+            self.__thread = None
+
+    def positions(self, now=None):
+        'Return positions interpolated one step behind now.'
+        (time_1, older), (time_2, newer) = self.__snapshots
+        if now is None:
+            now = _time.perf_counter()
+        if time_2 <= time_1:
+            return newer
+        ratio = min(max((now - self.__dt - time_1) / (time_2 - time_1), 0.0), 1.0)
+        return [(x_1 + (x_2 - x_1) * ratio, y_1 + (y_2 - y_1) * ratio)
+                for (x_1, y_1), (x_2, y_2) in zip(older, newer)]
+
+    def __run(self):
+        'Private class method.'
+        while self.__running:
+            due = self.__start + self.steps * self.__dt
+            self.session.step()
+            self.steps += 1
+            self.__snapshots = self.__snapshots[1], (due, self.session.positions())
+            delay = due + self.__dt - _time.perf_counter()
+            if delay > 0:
+                _time.sleep(delay)
+
+################################################################################
+
+class Scheduler:
+
+    '''Scheduler(rate[, limit]) -> Scheduler
+
+    The scheduler turns real elapsed time into fixed steps of
+    1 / rate seconds. Each tick returns how many steps are due,
+    but never more than limit; the rest of the backlog is dropped
+    and counted in skipped, so a stall is not followed by a burst
+    of catching up. Steps run by the same tick beyond the first
+    are counted in merged. The time attribute is the simulated
+    time of the steps that were returned, which falls behind real
+    time by the steps that were skipped.'''
+
+    def __init__(self, rate, limit=4):
+        'Initialize the Scheduler object.'
+        self.rate = rate
+        self.limit = limit
+        self.steps = 0
+        self.skipped = 0
+        self.merged = 0
+        self.start()
+
+    @property
+    def time(self):
+        'Simulated seconds of the steps returned so far.'
+        return self.steps / self.rate
+
+    def start(self, now=None):
+        'Start counting real time from now.'
+        self.__last = _time.perf_counter() if now is None else now
+        self.__owed = 0.0
+
+    def tick(self, now=None):
+        'Return the number of steps to run now.'
+        if now is None:
+            now = _time.perf_counter()
+        self.__owed += max(now - self.__last, 0.0) * self.rate
+        self.__last = now
+        due = int(self.__owed)
+        self.__owed -= due
+        if due > self.limit:
+            self.skipped += due - self.limit
+            due = self.limit
+        if due > 1:
+            self.merged += due - 1
+        self.steps += due
+        return due
+
+    def delay(self, now=None):
+        'Return the milliseconds until the next step is due.'
+        if now is None:
+            now = _time.perf_counter()
+        wait = (1.0 - self.__owed) / self.rate - (now - self.__last)
+        return max(int(wait * 1000) + 1, 1)
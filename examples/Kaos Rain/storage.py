@@ -0,0 +1,165 @@
+#! /usr/bin/env python3
+'''Module for storing settings.
+
+This module provides the places that Kaos Rain can keep its
+settings in: the Windows Registry or a JSON file. Settings
+are grouped into sections of named values; a store loads one
+section at a time and saves only the values it is handed.'''
+
+################################################################################
+
+import json as _json
+import os as _os
+import sys as _sys
+import winreg2 as _wi
+
+################################################################################
+
+class Registry:
+
+    'Registry(path) -> Registry'
+
+    def __init__(self, path):
+        'Initialize the Registry object.'
+        self.path = path
+
+    def __repr__(self):
+        'Return the object\'s representation.'
+        return 'Registry(%r)' % self.path
+
+    def sections(self):
+        'Return the names of the sections.'
+        return tuple(_wi.Key(_wi.HKEY.CURRENT_USER, self.path).keys)
+
+    def load(self, section):
+        'Return a dictionary of the values in section.'
+        key = _wi.Key(_wi.Key(_wi.HKEY.CURRENT_USER, self.path), section)
+        return dict((name, _unpack(key.values[name])) for name in key.values)
+
+    def save(self, changes):
+        'Save changes, a dictionary of section: (changed, deleted).'
+        for section, (changed, deleted) in changes.items():
+            key = _get_key(_wi.HKEY.CURRENT_USER, self.path + '\\' + section, _wi.KEY.ALL_ACCESS)
+            for name in deleted:
+                if name in key.values:
+                    del key.values[name]
+            for name, value in changed.items():
+                key.values[name] = _pack(value)
+
+    def delete(self):
+        'Delete the key and all empty parent keys.'
+        key, parent = _delete(*self.path.rsplit('\\', 1))
+        while '\\' in key and _empty(parent):
+            key, parent = _delete(*key.rsplit('\\', 1))
+
+################################################################################
+
+class JSON:
+
+    'JSON(filename) -> JSON'
+
+    def __init__(self, filename):
+        'Initialize the JSON object.'
+        self.filename = filename
+        self.__document = None
+
+    def __repr__(self):
+        'Return the object\'s representation.'
+        return 'JSON(%r)' % self.filename
+
+    def sections(self):
+        'Return the names of the sections.'
+        return tuple(self.__read())
+
+    def load(self, section):
+        'Return a dictionary of the values in section.'
+        return dict((name, list(value) if isinstance(value, list) else value)
+                    for name, value in self.__read()[section].items())
+
+    def save(self, changes):
+        'Save changes, a dictionary of section: (changed, deleted).'
+        try:
+            document = self.__read()
+        except EnvironmentError:
+            document = {}
+        for section, (changed, deleted) in changes.items():
+            values = document.setdefault(section, {})
+            for name in deleted:
+                values.pop(name, None)
+            values.update(changed)
+        directory = _os.path.dirname(self.filename)
+        if directory and not _os.path.isdir(directory):
+            _os.makedirs(directory)
+        with open(self.filename + '.tmp', 'w') as file:
+            _json.dump(document, file, indent=4, sort_keys=True)
+        _os.replace(self.filename + '.tmp', self.filename)
+        self.__document = document
+
+    def delete(self):
+        'Delete the file.'
+        self.__document = None
+        if _os.path.exists(self.filename):
+            _os.remove(self.filename)
+
+    def __read(self):
+        'Private class method.'
+        if self.__document is None:
+            with open(self.filename) as file:
+                self.__document = _json.load(file)
+        return self.__document
+
+################################################################################
+
+def default(path):
+    'Return the store for the registry path on this platform.'
+    if _sys.platform == 'win32':
+        return Registry(path)
+    home = _os.path.join(_os.path.expanduser('~'), '.config')
+    return JSON(_os.path.join(home, *path.split('\\')[1:]) + '.json')
+
+################################################################################
+
+def _pack(value):
+    'Correctly package the value.'
+    if isinstance(value, str):
+        return _wi.REG_SZ(value)
+    elif isinstance(value, int):
+        return _wi.REG_DWORD(value)
+    elif isinstance(value, list):
+        return _wi.REG_MULTI_SZ(value)
+    raise NotImplementedError('Cannot solve for %s' % type(value))
+
+def _unpack(value):
+    'Correctly unpack the value.'
+    if isinstance(value, _wi.REG_SZ):
+        return str(value.value)
+    elif isinstance(value, _wi.REG_DWORD):
+        return int(value.value)
+    elif isinstance(value, _wi.REG_MULTI_SZ):
+        return list(map(str, value.value))
+    raise NotImplementedError('Cannot solve for %s' % type(value))
+
+def _get_key(key, subkey, mode=None):
+    'Return the specified subkey, creating it if needed.'
+    key = _wi.Key(key)
+    for subkey in subkey.split('\\'):
+        if subkey not in key.keys:
+            key.keys = subkey
+        key = key.keys[subkey]
+    return _wi.Key(key, mode=mode)
+
+def _delete(key, subkey):
+    'Delete key and all subkeys.'
+    parent = _wi.Key(_wi.HKEY.CURRENT_USER, key)
+    del parent.keys[subkey].keys
+    del parent.keys[subkey]
+    return key, parent
+
+def _empty(key):
+    'Test for lack of values.'
+    if key.values:
+        return False
+    for name in key.keys:
+        if not _empty(key.keys[name]):
+            return False
+    return True
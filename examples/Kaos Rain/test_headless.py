@@ -0,0 +1,34 @@
+#! /usr/bin/env python3
+'Tests for the headless module.'
+
+################################################################################
+
+import unittest
+
+import headless
+
+################################################################################
+
+class RunTest(unittest.TestCase):
+
+    def test_seeded_runs_repeat(self):
+        for options in {}, {'grid': False}, {'kernel': 'angle'}, {'swept': True}:
+            first = headless.run(20, 200, 5, **options)
+            self.assertEqual(headless.run(20, 200, 5, **options).digest, first.digest, options)
+        self.assertNotEqual(headless.run(20, 200, 6).digest, headless.run(20, 200, 5).digest)
+
+    def test_grid_matches_all_pairs(self):
+        self.assertEqual(headless.run(20, 200, 5).digest, headless.run(20, 200, 5, grid=False).digest)
+
+    def test_report(self):
+        report = headless.run(5, 10, P_FPS=30)
+        self.assertEqual((report.balls, report.steps), (5, 10))
+        self.assertIn('state: ' + report.digest, str(report))
+
+    def test_unknown_setting(self):
+        self.assertRaises(KeyError, headless.settings, B_SIZE=3)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main()
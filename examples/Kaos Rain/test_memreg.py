@@ -0,0 +1,84 @@
+#! /usr/bin/env python3
+'Tests for the memreg module.'
+
+################################################################################
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import defaults
+import memreg
+import storage
+
+################################################################################
+
+PATH = 'Software\\Atlantis Zero\\Kaos Rain\\Version 4'
+
+class MemregTest(unittest.TestCase):
+
+    def setUp(self):
+        memreg.clear()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        memreg.clear()
+        del memreg._attached[:]
+        shutil.rmtree(self.directory)
+
+    def test_keys_and_values(self):
+        key = memreg.CreateKey(memreg.HKEY_CURRENT_USER, 'Software\\Test')
+        memreg.SetValueEx(key, 'Name', 0, memreg.REG_SZ, 'value')
+        again = memreg.OpenKey(memreg.HKEY_CURRENT_USER, 'SOFTWARE\\test')
+        self.assertEqual(memreg.QueryValueEx(again, 'NAME'), ('value', memreg.REG_SZ))
+        self.assertEqual(memreg.EnumValue(again, 0), ('Name', 'value', memreg.REG_SZ))
+        self.assertEqual(memreg.EnumKey(memreg.OpenKey(memreg.HKEY_CURRENT_USER, 'Software'), 0), 'Test')
+        self.assertEqual(memreg.QueryInfoKey(again)[:2], (0, 1))
+        self.assertRaises(OSError, memreg.EnumValue, again, 1)
+        memreg.DeleteValue(again, 'name')
+        self.assertRaises(FileNotFoundError, memreg.QueryValueEx, again, 'Name')
+
+    def test_delete_key(self):
+        memreg.CreateKey(memreg.HKEY_CURRENT_USER, 'A\\B')
+        self.assertRaises(PermissionError, memreg.DeleteKey, memreg.HKEY_CURRENT_USER, 'A')
+        memreg.DeleteKey(memreg.HKEY_CURRENT_USER, 'A\\B')
+        memreg.DeleteKey(memreg.HKEY_CURRENT_USER, 'A')
+        self.assertRaises(FileNotFoundError, memreg.OpenKey, memreg.HKEY_CURRENT_USER, 'A')
+
+    def test_save_and_load_key(self):
+        key = memreg.CreateKey(memreg.HKEY_CURRENT_USER, 'Old\\Sub')
+        memreg.SetValueEx(key, 'X', 0, memreg.REG_SZ, 'y')
+        file_name = os.path.join(self.directory, 'hive')
+        memreg.SaveKey(memreg.OpenKey(memreg.HKEY_CURRENT_USER, 'Old'), file_name)
+        memreg.LoadKey(memreg.HKEY_CURRENT_USER, 'New', file_name)
+        key = memreg.OpenKey(memreg.HKEY_CURRENT_USER, 'New\\Sub')
+        self.assertEqual(memreg.QueryValueEx(key, 'X'), ('y', memreg.REG_SZ))
+
+    def test_attach_and_flush(self):
+        file_name = os.path.join(self.directory, 'hive')
+        memreg.attach(file_name)
+        memreg.SetValue(memreg.HKEY_CURRENT_USER, 'Kept', memreg.REG_SZ, 'text')
+        memreg.flush()
+        memreg.clear()
+        memreg.attach(file_name)
+        self.assertEqual(memreg.QueryValue(memreg.HKEY_CURRENT_USER, 'Kept'), 'text')
+
+    @unittest.skipIf(storage._wi._winreg is not memreg, 'winreg2 uses the real registry')
+    def test_registry_store_round_trip(self):
+        store = storage.Registry(PATH)
+        store.save({'GAM': (dict(defaults.GAM), ()),
+                    'HST': (dict((str(key), value) for key, value in defaults.HST.items()), ())})
+        self.assertEqual(sorted(store.sections()), ['GAM', 'HST'])
+        self.assertEqual(store.load('GAM'), defaults.GAM)
+        self.assertEqual(store.load('HST')['540'], defaults.HST[540])
+        store.save({'GAM': ({'B_ALL': 1}, {'B_RAD'})})
+        self.assertEqual(store.load('GAM')['B_ALL'], 1)
+        self.assertNotIn('B_RAD', store.load('GAM'))
+        store.delete()
+        self.assertRaises(FileNotFoundError, memreg.OpenKey, memreg.HKEY_CURRENT_USER, 'Software\\Atlantis Zero')
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+#! /usr/bin/env python3
+'Tests for the physics module.'
+
+################################################################################
+
+import random
+import unittest
+
+import headless
+import physics
+import simulation
+
+################################################################################
+
+def scatter(count, radius, size, seed):
+    'Return count balls placed at random in a square of size.'
+    rng = random.Random(seed)
+    return [physics.Ball(rng.uniform(-radius, size), rng.uniform(-radius, size), radius)
+            for ball in range(count)]
+
+def touching(pairs):
+    'Return the index pairs of the balls that touch.'
+    return set((ball_1.index, ball_2.index) for ball_1, ball_2 in pairs
+               if abs(ball_2.pos - ball_1.pos) <= ball_1.rad + ball_2.rad)
+
+################################################################################
+
+class GridTest(unittest.TestCase):
+
+    def test_matches_all_pairs(self):
+        for seed in range(5):
+            balls = scatter(300, 15, 450, seed)
+            for index, ball in enumerate(balls):
+                ball.index = index
+            expected = touching(physics.pairs(balls))
+            self.assertTrue(expected)
+            self.assertEqual(touching(physics.Grid(15).pairs(balls)), expected)
+
+    def test_pairs_are_unique_and_ordered(self):
+        balls = scatter(200, 15, 120, 0)
+        for index, ball in enumerate(balls):
+            ball.index = index
+        found = [(ball_1.index, ball_2.index) for ball_1, ball_2 in physics.Grid(15).pairs(balls)]
+        self.assertEqual(len(found), len(set(found)))
+        self.assertTrue(all(index_1 < index_2 for index_1, index_2 in found))
+
+    def test_larger_cells_find_farther_pairs(self):
+        balls = [physics.Ball(0, 0, 5), physics.Ball(35, 0, 5)]
+        self.assertEqual(list(physics.Grid(5).pairs(balls)), [])
+        self.assertEqual(list(physics.Grid(20).pairs(balls)), [tuple(balls)])
+
+class KernelTest(unittest.TestCase):
+
+    def test_dot_matches_angle(self):
+        for seed in range(3):
+            self.assertEqual(headless.compare_kernels(20000, seed), [])
+
+    def test_angle_matches_vector(self):
+        for ball_1, ball_2 in headless.touching(2000, 0):
+            errors = []
+            for kernel in physics.KERNELS['angle'], physics.KERNELS['vector']:
+                ball_1.err.set(0.0, 0.0)
+                ball_2.err.set(0.0, 0.0)
+                kernel(ball_1, ball_2)
+                errors.append((tuple(ball_1.err), tuple(ball_2.err)))
+            self.assertEqual(errors[0], errors[1])
+
+    def test_separating_balls_are_left_alone(self):
+        for name, kernel in physics.KERNELS.items():
+            ball_1, ball_2 = physics.Ball(0, 0, 10), physics.Ball(15, 0, 10)
+            ball_1.vel.set(-5, 3)
+            ball_2.vel.set(5, 3)
+            kernel(ball_1, ball_2)
+            self.assertEqual(tuple(ball_1.err) + tuple(ball_2.err), (0, 0, 0, 0), name)
+
+    def test_head_on_balls_swap_velocities(self):
+        for name, kernel in physics.KERNELS.items():
+            ball_1, ball_2 = physics.Ball(0, 0, 10), physics.Ball(15, 0, 10)
+            ball_1.vel.set(5, 0)
+            ball_2.vel.set(-5, 0)
+            kernel(ball_1, ball_2)
+            ball_1.correct()
+            ball_2.correct()
+            self.assertAlmostEqual(ball_1.vel.x, -5, msg=name)
+            self.assertAlmostEqual(ball_2.vel.x, 5, msg=name)
+
+class WorldTest(unittest.TestCase):
+
+    def session(self, numpy, seed):
+        'Return a session of 60 balls with every pair crashed by the dot rule.'
+        PHY, GAM, TMR = headless.settings(B_ALL=60)
+        session = simulation.Session(PHY, GAM, TMR, random.Random(seed), False, numpy)
+        session.build_balls()
+        return session
+
+    @unittest.skipIf(physics._numpy is None, 'NumPy is not installed')
+    def test_matches_balls(self):
+        for seed in range(3):
+            balls, world = self.session(False, seed), self.session(True, seed)
+            for step in range(100):
+                balls.step()
+                world.step()
+            for ball, pos in zip(balls.positions(), world.positions()):
+                self.assertAlmostEqual(ball[0], pos[0], 6)
+                self.assertAlmostEqual(ball[1], pos[1], 6)
+            world.store()
+            self.assertEqual(world.positions(), [(ball.pos.x, ball.pos.y) for ball in world.balls])
+
+class SweptTest(unittest.TestCase):
+
+    def session(self, swept):
+        'Return a session at 4 steps a second with two balls closing fast.'
+        PHY, GAM, TMR = headless.settings(B_ALL=2, P_FPS=4)
+        session = simulation.Session(PHY, GAM, TMR, random.Random(0), swept=swept)
+        ball_1, ball_2 = session.build_balls()
+        ball_1.pos.set(150, 300)
+        ball_2.pos.set(300, 300)
+        ball_1.vel.set(PHY.S_LIMIT, 0)
+        ball_2.vel.set(-PHY.S_LIMIT, 0)
+        return session
+
+    def test_time_of_impact(self):
+        self.assertAlmostEqual(physics.toi(physics.Vector(50, 0), physics.Vector(1000, 0), 10), 0.04)
+        self.assertEqual(physics.toi(physics.Vector(5, 0), physics.Vector(-1, 0), 10), 0.0)
+        self.assertIsNone(physics.toi(physics.Vector(50, 0), physics.Vector(-1000, 0), 10))
+        self.assertIsNone(physics.toi(physics.Vector(50, 50), physics.Vector(1000, 0), 10))
+
+    def test_fast_ball_does_not_pass(self):
+        for swept in False, True:
+            ball_1, ball_2 = physics.Ball(0, 0, 5), physics.Ball(50, 0, 5)
+            ball_1.vel.set(1000, 0)
+            if swept:
+                ball_1.crash_swept(ball_2, 0.1)
+            else:
+                ball_1.crash_dot(ball_2)
+            for ball in ball_1, ball_2:
+                ball.correct()
+                ball.move(10)
+            # the dot kernel only sees balls that touch at the end of a step
+            self.assertEqual(ball_1.pos.x < ball_2.pos.x, swept)
+
+    def test_session_balls_bounce(self):
+        for swept in False, True:
+            session = self.session(swept)
+            session.step()
+            ball_1, ball_2 = session.balls
+            self.assertEqual(ball_1.pos.x < ball_2.pos.x, swept)
+
+    def test_session_floor(self):
+        session = self.session(True)
+        GAM = session.GAM
+        floor = GAM.SCR_H - GAM.F_OFF - GAM.B_RAD
+        for ball in session.balls:
+            ball.pos.y = floor - 10
+            ball.vel.y = session.PHY.S_LIMIT
+        for step in range(20):
+            session.step()
+            for ball in session.balls:
+                self.assertLessEqual(ball.pos.y, floor)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main()
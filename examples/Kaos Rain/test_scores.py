@@ -0,0 +1,85 @@
+#! /usr/bin/env python3
+'Tests for the scores module.'
+
+################################################################################
+
+import copy
+import random
+import unittest
+
+import defaults
+import scores
+
+################################################################################
+
+def old_win(table, score, name):
+    'Add the name the way win() did before the Leaderboard.'
+    if score in table:
+        table[score].insert(0, name)
+    else:
+        table[score] = [name]
+    loser = min(table)
+    if len(table[loser]) > 1:
+        del table[loser][-1]
+    else:
+        del table[loser]
+
+def old_format(table, width, length, spacer):
+    'Format the table the way format_HST() did before the Leaderboard.'
+    lines = []
+    for key in sorted(table, reverse=True):
+        score = ' ' + str(key)
+        for name in table[key]:
+            lines.append((name[:length] + ' ').ljust(width - len(score), spacer) + score)
+    return '\n'.join(lines)
+
+################################################################################
+
+class LeaderboardTest(unittest.TestCase):
+
+    def test_matches_old_algorithm(self):
+        for seed in range(3):
+            rng = random.Random(seed)
+            old = copy.deepcopy(defaults.HST)
+            new = copy.deepcopy(defaults.HST)
+            board = scores.Leaderboard(new, len(old))
+            for game in range(2000):
+                score = rng.randrange(0, 601, rng.choice((1, 60)))
+                if score < board.lowest():
+                    continue
+                name = 'player %d' % game
+                old_win(old, score, name)
+                board.insert(score, name)
+                board.save(new)
+                self.assertEqual(new, old)
+                self.assertEqual(board.lowest(), min(old))
+                self.assertEqual(board.format(40, 20, '.'), old_format(old, 40, 20, '.'))
+
+    def test_insert_returns_evicted(self):
+        board = scores.Leaderboard({10: ['a', 'b'], 5: ['c']}, 3)
+        self.assertEqual(board.insert(7, 'd'), [(5, 'c')])
+        self.assertEqual(board.insert(10, 'e'), [(7, 'd')])
+        self.assertEqual(list(board), [(10, 'e'), (10, 'a'), (10, 'b')])
+        self.assertEqual(len(board), 3)
+
+    def test_save_writes_only_changes(self):
+        table = {10: ['a'], 5: ['b']}
+        board = scores.Leaderboard(table, 2)
+        board.insert(7, 'c')
+        changes = {}
+        board.save(changes)
+        self.assertEqual(changes, {7: ['c']})
+        board = scores.Leaderboard(table, 2)
+        board.insert(7, 'c')
+        board.save(table)
+        self.assertEqual(table, {10: ['a'], 7: ['c']})
+
+    def test_rejects_bad_tables(self):
+        for table in {'10': ['a']}, {10: 'a'}, {10: [1]}, {10: ['a', 'b', 'c']}:
+            with self.assertRaises(ValueError):
+                scores.Leaderboard(table, 2)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+#! /usr/bin/env python3
+'Tests for the simulation module.'
+
+################################################################################
+
+import unittest
+
+import simulation
+
+################################################################################
+
+class SchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = simulation.Scheduler(8, limit=4)
+        self.scheduler.start(100.0)
+
+    def test_steps_follow_the_clock(self):
+        scheduler = self.scheduler
+        self.assertEqual([scheduler.tick(now) for now in (100.0625, 100.125, 100.1875, 100.25)], [0, 1, 0, 1])
+        self.assertEqual((scheduler.steps, scheduler.skipped, scheduler.merged), (2, 0, 0))
+        self.assertEqual(scheduler.time, 0.25)
+
+    def test_late_ticks_merge_steps(self):
+        scheduler = self.scheduler
+        self.assertEqual(scheduler.tick(100.375), 3)
+        self.assertEqual(scheduler.tick(100.5), 1)
+        self.assertEqual((scheduler.steps, scheduler.skipped, scheduler.merged), (4, 0, 2))
+
+    def test_stall_is_capped(self):
+        scheduler = self.scheduler
+        self.assertEqual(scheduler.tick(102.125), 4)
+        self.assertEqual((scheduler.steps, scheduler.skipped, scheduler.merged), (4, 13, 3))
+        # the skipped steps are not made up later
+        self.assertEqual(scheduler.tick(102.25), 1)
+        self.assertEqual(scheduler.time, 0.625)
+
+    def test_clock_going_back(self):
+        scheduler = self.scheduler
+        self.assertEqual(scheduler.tick(99.0), 0)
+        self.assertEqual(scheduler.tick(99.125), 1)
+
+    def test_delay(self):
+        scheduler = self.scheduler
+        self.assertEqual(scheduler.delay(100.0), 126)
+        scheduler.tick(100.0625)
+        self.assertEqual(scheduler.delay(100.0625), 63)
+        self.assertEqual(scheduler.delay(100.25), 1)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main()
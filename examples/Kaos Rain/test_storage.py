@@ -0,0 +1,77 @@
+#! /usr/bin/env python3
+'Tests for the storage module.'
+
+################################################################################
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import defaults
+import storage
+
+################################################################################
+
+class JSONTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'Kaos Rain', 'Version 4.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def install(self):
+        'Save the defaults the way install.pyw does.'
+        store = storage.JSON(self.filename)
+        changes = {}
+        for name in dir(defaults):
+            if name.isupper():
+                database = getattr(defaults, name)
+                changes[name] = dict((str(key), database[key]) for key in database), ()
+        store.save(changes)
+        return store
+
+    def test_round_trip(self):
+        self.install()
+        store = storage.JSON(self.filename)
+        self.assertEqual(sorted(store.sections()), sorted(filter(str.isupper, dir(defaults))))
+        self.assertEqual(store.load('GAM'), defaults.GAM)
+        self.assertEqual(store.load('HST'), dict((str(key), value) for key, value in defaults.HST.items()))
+
+    def test_save_only_touches_changes(self):
+        self.install()
+        storage.JSON(self.filename).save({'HST': ({'600': ['winner']}, {'0'}),
+                                          'TMR': ({'LIMIT': 300}, ())})
+        store = storage.JSON(self.filename)
+        hst = store.load('HST')
+        self.assertEqual(hst['600'], ['winner'])
+        self.assertNotIn('0', hst)
+        self.assertEqual(len(hst), len(defaults.HST))
+        tmr = dict(defaults.TMR, LIMIT=300)
+        self.assertEqual(store.load('TMR'), tmr)
+        self.assertEqual(store.load('GAM'), defaults.GAM)
+
+    def test_load_returns_copies(self):
+        store = self.install()
+        store.load('HST')['540'].append('cheater')
+        self.assertEqual(store.load('HST')['540'], defaults.HST[540])
+
+    def test_file_is_replaced_whole(self):
+        self.install()
+        self.assertFalse(os.path.exists(self.filename + '.tmp'))
+        with open(self.filename) as file:
+            self.assertEqual(json.load(file)['GAM'], defaults.GAM)
+
+    def test_delete(self):
+        store = self.install()
+        store.delete()
+        self.assertFalse(os.path.exists(self.filename))
+        self.assertRaises(EnvironmentError, store.sections)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main()
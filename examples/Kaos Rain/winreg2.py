@@ -2,7 +2,9 @@
 '''Module for accessing MWR.
 
 This module provides an advanced, easy-to-use API for
-accessing and mutating the Microsoft Windows Registry.'''
+accessing and mutating the Microsoft Windows Registry.
+Where winreg is missing, the in-memory hive from memreg
+stands in for the registry.'''
 
 ################################################################################
 
@@ -16,10 +18,14 @@ F. Drake, for enforcing good Python documentation.'''
 
 ################################################################################
 
-import winreg as _winreg
 import sys as _sys
 import time as _time
 
+try:
+    import winreg as _winreg
+except ImportError:
+    import memreg as _winreg
+
 ################################################################################
 
 class HKEY:
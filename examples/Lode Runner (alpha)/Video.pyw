@@ -1,6 +1,10 @@
 #! /usr/bin/env python3
 import source.main as Demo
 
+SKIP = 80 # frames skipped with Left and Right (10 seconds)
+JUMP = 480 # frames skipped with Prior and Next (1 minute)
+FAST = 4 # frames shown at a time while fast-forwarding
+
 ################################################################################
 
 class Screen(Demo.util.Screen3):
@@ -28,6 +32,13 @@ class Screen(Demo.util.Screen3):
         # quit program
         self.root.protocol('WM_DELETE_WINDOW', self.exit)
         self.root.bind_all('<Escape>', self.exit)
+        # seek, scrub, and fast-forward
+        self.root.bind_all('<Left>', Demo.Call(skip, -SKIP))
+        self.root.bind_all('<Right>', Demo.Call(skip, SKIP))
+        self.root.bind_all('<Prior>', Demo.Call(skip, -JUMP))
+        self.root.bind_all('<Next>', Demo.Call(skip, JUMP))
+        self.root.bind_all('<Home>', Demo.Call(seek, 0))
+        self.root.bind_all('<space>', Demo.Call(fast))
         # CANVAS
         self.canvas = Demo.util.Canvas(self.root, width=w, height=h)
         self.canvas.config(background=self.BACKGROUND_COLOR)
@@ -111,24 +122,23 @@ class Screen(Demo.util.Screen3):
 def main():
     # Provide menus and load the data.
     Demo.select_theme()
-    history = load_video()
+    filename = load_video()
     Demo.load_images()
     load_sounds()
+    load_index(filename)
     # Show the video and close the buffer.
+    history = open(filename, 'rb')
     try:
         play(history)
     finally:
         history.close()
+        if index is not None:
+            index.file.close()
 
 def load_video():
-    filename = Demo.tkinter.filedialog.askopenfilename(title='Open Video', filetypes=['Video .gva', 'Audio/Video .gvb'])
+    filename = Demo.tkinter.filedialog.askopenfilename(title='Open Video', filetypes=['Video .gva', 'Audio/Video .gvb', 'Stream Video .gvc'])
     if filename:
-        history = Demo.tempfile.TemporaryFile()
-        data = Demo.zlib.decompress(open(filename, 'rb').read())
-        history.write(data)
-        del data
-        history.seek(0)
-        return history
+        return filename
     else:
         raise SystemExit
 
@@ -137,18 +147,30 @@ def load_sounds():
     sound = Demo.sounds.Server(Demo.util.os.path.join(Demo.util.os.getcwd(), 'themes', Screen.IMAGE_THEME, 'theme_config.xml'), Demo.DummyFile())
     Screen.BACKGROUND_COLOR = sound.BACKGROUND_COLOR
 
+def load_index(filename):
+    global index
+    # streaming videos have an index, legacy videos may have a sidecar
+    index = Demo.recording.load_index(filename)
+    if index is None and Demo.tkinter.messagebox.askyesno('Index', 'Do you want to build an index so that you can seek in this video?'):
+        index = Demo.recording.load_index(filename, True)
+
 ################################################################################
 
 def play(history):
-    global frames, screen, c_height, c_width, frame
-    frames = history
+    global frames, screen, c_height, c_width, frame, position, speed
+    # read indexed videos from the index and others as they decompress
+    frames = Demo.recording.events(history) if index is None else index.events()
     # setup first frame
-    frame = Demo.util.cPickle.load(history)
+    frame = next(frames)
+    position = 1
+    speed = 1
     while True:
         c_height = len(frame)
         c_width = len(frame[0])
         # make screen
         screen = Screen(frame, updater, Demo.root)
+        # show any actors (after a seek)
+        screen.update(frame)
         try:
             screen.root.mainloop()
         except SystemExit as error:
@@ -159,21 +181,38 @@ def play(history):
                 break
 
 def updater():
-    global frame
-    # load the next frame
-    frame = Demo.util.cPickle.load(frames)
-    # check to see if it is a sound
-    while isinstance(frame, tuple):
-        sound.play(*frame)
-        frame = Demo.util.cPickle.load(frames)
-    # frame size
-    height = len(frame)
-    width = len(frame[0])
-    # check to see if a new screen needs to be built
-    assert height == c_height and width == c_width
+    global frame, position
+    for step in range(speed):
+        # load the next frame
+        frame = next(frames)
+        # check to see if it is a sound (quiet while fast-forwarding)
+        while isinstance(frame, tuple):
+            if speed == 1:
+                sound.play(*frame)
+            frame = next(frames)
+        position += 1
+        # frame size
+        height = len(frame)
+        width = len(frame[0])
+        # check to see if a new screen needs to be built
+        assert height == c_height and width == c_width
     # update the current frame
     screen.update(frame)
 
+def seek(number):
+    global frames, position
+    # only indexed videos can seek
+    if index is not None:
+        position = max(0, min(number, index.frames - 1))
+        frames = index.events(position)
+
+def skip(frames):
+    seek(position + frames)
+
+def fast():
+    global speed
+    speed = 1 if speed == FAST else FAST
+
 ################################################################################
 
 if __name__ == '__main__':
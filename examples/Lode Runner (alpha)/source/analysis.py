@@ -0,0 +1,187 @@
+#! /usr/bin/env python3
+'''Module for analyzing game videos in bulk.
+
+This module reads every video in a directory on a pool of worker
+processes and reports, for each one, how many frames it has, where
+its scenes start, how often each sound was played, and how the score
+and the loads left changed over time. It can also re-encode legacy
+videos as streaming ones while it reads them. Run it with
+
+    python -m source.analysis [-r] [-t DIRECTORY] [-j JOBS] PATH ...'''
+
+__version__ = '1.0'
+
+import argparse as _argparse
+import collections as _collections
+import concurrent.futures as _futures
+import os as _os
+import sys as _sys
+import time as _time
+
+from . import recording as _recording
+
+################################################################################
+
+EXTENSIONS = 'gva', 'gvb', 'gvc'
+SCORE = 10      # points for each load picked up
+
+################################################################################
+
+class Scene:
+
+    'Scene(frame, height, width, loads) -> Scene'
+
+    def __init__(self, frame, height, width, loads):
+        'Initialize the Scene object.'
+        self.frame = frame
+        self.height = height
+        self.width = width
+        self.loads = loads
+        self.timeline = [(frame, 0, loads)]    # (frame, score, loads left)
+
+    def __repr__(self):
+        'Return the object\'s representation.'
+        return 'Scene(%r, %r, %r, %r)' % (self.frame, self.height, self.width, self.loads)
+
+################################################################################
+
+class Report:
+
+    'Report(filename) -> Report'
+
+    def __init__(self, filename):
+        'Initialize the Report object.'
+        self.filename = filename
+        self.size = _os.path.getsize(filename)
+        self.frames = 0
+        self.scenes = []
+        self.sounds = _collections.Counter()
+        self.seconds = 0.0
+        self.target = None
+        self.error = None
+
+    def __str__(self):
+        'Return the report as text.'
+        if self.error is not None:
+            return '%s: %s' % (self.filename, self.error)
+        lines = ['%s: %d frames, %d scenes, %d bytes, %.2f s' % (self.filename, self.frames, len(self.scenes), self.size, self.seconds)]
+        for number, scene in enumerate(self.scenes, 1):
+            frame, score, loads = scene.timeline[-1]
+            lines.append('  scene %d at frame %d (%dx%d): score %d, %d of %d loads left, %d changes' %
+                         (number, scene.frame, scene.width, scene.height, score, loads, scene.loads, len(scene.timeline) - 1))
+        if self.sounds:
+            lines.append('  sounds: ' + ', '.join('%s %d' % pair for pair in sorted(self.sounds.items())))
+        if self.target is not None:
+            lines.append('  re-encoded as %s (%d bytes)' % (self.target, _os.path.getsize(self.target)))
+        return '\n'.join(lines)
+
+################################################################################
+
+def analyze(filename, directory=None, level=_recording.LEVEL):
+    '''Return the Report for the video.
+
+    If directory is given, legacy videos are also re-encoded there as
+    streaming videos. The score goes up with each "score" sound; videos
+    without sounds (.gva) count each load that disappears instead.'''
+    report = Report(filename)
+    start = _time.perf_counter()
+    try:
+        with open(filename, 'rb') as source:
+            sink = None
+            if directory is not None and not _recording.is_stream(source):
+                report.target = _os.path.join(directory, _os.path.splitext(_os.path.basename(filename))[0] + '.gvc')
+                sink = _recording.Recorder(open(report.target, 'wb'), level=level)
+            try:
+                _scan(report, source, sink)
+            finally:
+                if sink is not None:
+                    sink.close()
+                    sink.file.close()
+    except Exception as error:
+        report.error = '%s: %s' % (type(error).__name__, error)
+    report.seconds = _time.perf_counter() - start
+    return report
+
+def find(paths, recursive=False):
+    'Return the videos in paths (files or directories) in order.'
+    videos = []
+    for path in paths:
+        if _os.path.isdir(path):
+            for root, folders, files in _os.walk(path):
+                videos.extend(_os.path.join(root, name) for name in sorted(files)
+                              if _os.path.splitext(name)[1].lstrip('.').lower() in EXTENSIONS)
+                if not recursive:
+                    break
+                folders.sort()
+        else:
+            videos.append(path)
+    return videos
+
+def run(videos, directory=None, level=_recording.LEVEL, jobs=None):
+    'Yield the Report of each video, analyzed on a process pool.'
+    with _futures.ProcessPoolExecutor(jobs) as pool:
+        work = [pool.submit(analyze, video, directory, level) for video in videos]
+        for future in work:
+            yield future.result()
+
+################################################################################
+
+def main(argv=None):
+    'Analyze videos from the command line.'
+    parser = _argparse.ArgumentParser(prog='python -m source.analysis', description='Report on (and re-encode) Lode Runner videos.')
+    parser.add_argument('paths', nargs='+', metavar='PATH', help='videos or directories of videos')
+    parser.add_argument('-r', '--recursive', action='store_true', help='look in subdirectories too')
+    parser.add_argument('-t', '--transcode', metavar='DIRECTORY', help='re-encode legacy videos as .gvc files here')
+    parser.add_argument('-l', '--level', type=int, default=_recording.LEVEL, choices=range(10), metavar='0-9', help='compression level (default %d)' % _recording.LEVEL)
+    parser.add_argument('-j', '--jobs', type=int, help='worker processes (default: one per core)')
+    args = parser.parse_args(argv)
+    if args.transcode and not _os.path.isdir(args.transcode):
+        _os.makedirs(args.transcode)
+    videos = find(args.paths, args.recursive)
+    start = _time.perf_counter()
+    frames = size = failed = 0
+    for report in run(videos, args.transcode, args.level, args.jobs):
+        print(report)
+        frames += report.frames
+        size += report.size
+        failed += report.error is not None
+    seconds = _time.perf_counter() - start
+    print('%d videos, %d frames, %.2f MB in %.2f s: %.0f frames/s, %.2f MB/s' %
+          (len(videos), frames, size / 1e6, seconds, frames / seconds if seconds else 0, size / 1e6 / seconds if seconds else 0))
+    return 1 if failed else 0
+
+################################################################################
+
+def _scan(report, source, sink):
+    'Fill in the report from the video, copying it to sink if given.'
+    scene = None
+    score = 0
+    counted = False     # whether "score" sounds keep the score
+    for item in _recording.events(source):
+        if isinstance(item, tuple):
+            name, block = item
+            report.sounds[name] += 1
+            if name == 'score':
+                counted = True
+                score += SCORE
+            if sink is not None:
+                sink.sound(name, block)
+            continue
+        loads = sum(row.count(('*', None)) + row.count(('*', '^')) + row.count(('*', '&')) for row in item)
+        if scene is None or len(item) != scene.height or len(item[0]) != scene.width:
+            scene = Scene(report.frames, len(item), len(item[0]), loads)
+            report.scenes.append(scene)
+            score = 0
+        else:
+            if not counted:
+                score = SCORE * max(scene.loads - loads, 0)
+            if scene.timeline[-1][1:] != (score, loads):
+                scene.timeline.append((report.frames, score, loads))
+        if sink is not None:
+            sink.frame(item)
+        report.frames += 1
+
+################################################################################
+
+if __name__ == '__main__':
+    _sys.exit(main())
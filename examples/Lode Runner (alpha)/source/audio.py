@@ -0,0 +1,260 @@
+#! /usr/bin/env python3
+'''Module for playing sounds.
+
+This module turns WAV files and PIF beeps into Sample objects, each
+holding 16-bit mono PCM at RATE samples per second. WAV files are
+decoded (and converted to that format) once, when they are loaded.
+Beeps are synthesized as square waves instead of being played with
+Beep calls and sleeps.
+
+A WAV file that cannot be decoded (such as one holding ADPCM) may
+still be kept as a Sample without data that only names the file;
+WinSound plays it by filename and the other backends skip it.
+
+Samples are played by a backend. Every backend has a play(sample)
+method that returns once the sample has played:
+
+    WinSound    plays through winsound (on Windows)
+    Stream      writes the PCM to a binary file, in real time or not
+    Pipe        writes the PCM to a player such as aplay or pacat
+    Null        plays nothing and counts the samples it was given
+
+default() picks the first of WinSound, Pipe, or Null that works;
+the music module of Influence picks its backends by the same rules.'''
+
+__version__ = '1.0'
+
+import array as _array
+import io as _io
+import shutil as _shutil
+import subprocess as _subprocess
+import sys as _sys
+import time as _time
+import wave as _wave
+
+try:
+    import winsound as _winsound
+except ImportError:
+    _winsound = None
+
+################################################################################
+
+RATE = 22050                # samples per second
+VOLUME = 8192               # amplitude of synthesized beeps
+STARTUP = 0.25              # seconds a player has to fail in
+
+PLAYERS = (('aplay', '-q', '-t', 'raw', '-f', 'S16_LE', '-c', '1', '-r', '{rate}'),
+           ('pacat', '--playback', '--format=s16le', '--channels=1', '--rate={rate}'))
+
+################################################################################
+
+class Sample:
+
+    'Sample(data[, filename]) -> Sample'
+
+    def __init__(self, data, filename=None):
+        'Initialize the Sample object.'
+        self.data = data
+        self.filename = filename
+        self.__wav = None
+
+    def __len__(self):
+        'Return the number of samples.'
+        return 0 if self.data is None else len(self.data)
+
+    @property
+    def seconds(self):
+        'How long the sample plays for (0 if it was not decoded).'
+        return len(self) / RATE
+
+    def pcm(self):
+        'Return the samples as little-endian bytes.'
+        if _sys.byteorder == 'little':
+            return self.data.tobytes()
+        data = _array.array('h', self.data)
+        data.byteswap()
+        return data.tobytes()
+
+    def wav(self):
+        'Return the sample as the bytes of a WAV file.'
+        if self.__wav is None:
+            file = _io.BytesIO()
+            with _wave.open(file, 'wb') as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(RATE)
+                wav.writeframes(self.pcm())
+            self.__wav = file.getvalue()
+        return self.__wav
+
+################################################################################
+
+class WinSound:
+
+    'WinSound() -> WinSound'
+
+    def play(self, sample):
+        'Play the sample with winsound.'
+        if sample.data is None:
+            _winsound.PlaySound(sample.filename, _winsound.SND_FILENAME)
+        else:
+            _winsound.PlaySound(sample.wav(), _winsound.SND_MEMORY)
+
+################################################################################
+
+class Stream:
+
+    '''Stream(file[, realtime]) -> Stream
+
+    The stream writes the PCM of each sample to a binary file. If
+    realtime is true, play waits until the sample would have been
+    heard, as it does with the other backends.'''
+
+    def __init__(self, file, realtime=False):
+        'Initialize the Stream object.'
+        self.file = file
+        self.realtime = realtime
+
+    def play(self, sample):
+        'Write the sample to the file.'
+        if sample.data is None:
+            return
+        start = _time.perf_counter()
+        self.file.write(sample.pcm())
+        self.file.flush()
+        if self.realtime:
+            _time.sleep(max(0, start + sample.seconds - _time.perf_counter()))
+
+    def close(self):
+        'Close the file.'
+        self.file.close()
+
+################################################################################
+
+class Pipe(Stream):
+
+    '''Pipe(command) -> Pipe
+
+    The pipe starts the command (a list of arguments) and streams
+    PCM to its standard input in real time. If the player goes away
+    (when there is no sound device, for example) the pipe is broken
+    and plays nothing from then on, like Null.'''
+
+    def __init__(self, command):
+        'Initialize the Pipe object.'
+        self.process = _subprocess.Popen(command, stdin=_subprocess.PIPE,
+                                         stdout=_subprocess.DEVNULL,
+                                         stderr=_subprocess.DEVNULL)
+        self.broken = False
+        super().__init__(self.process.stdin, True)
+
+    def alive(self, timeout=0):
+        'Return whether the player is still running after timeout seconds.'
+        try:
+            self.process.wait(timeout)
+        except _subprocess.TimeoutExpired:
+            return True
+        self.broken = True
+        return False
+
+    def play(self, sample):
+        'Write the sample to the player unless the pipe is broken.'
+        if not self.broken:
+            try:
+                super().play(sample)
+            except OSError:
+                self.broken = True
+
+    def close(self):
+        'Close the pipe and wait for the player to finish.'
+        try:
+            super().close()
+        except OSError:
+            pass
+        self.process.wait()
+
+################################################################################
+
+class Null:
+
+    'Null() -> Null'
+
+    def __init__(self):
+        'Initialize the Null object.'
+        self.played = 0
+        self.seconds = 0.0
+
+    def play(self, sample):
+        'Count the sample without playing it.'
+        self.played += 1
+        self.seconds += sample.seconds
+
+################################################################################
+
+def load_wav(filename):
+    'Return a Sample with the sound in the WAV file or raise ValueError.'
+    try:
+        with _wave.open(filename, 'rb') as wav:
+            channels = wav.getnchannels()
+            width = wav.getsampwidth()
+            rate = wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+    except (_wave.Error, EOFError) as error:
+        raise ValueError('cannot decode %s: %s' % (filename, error))
+    if width == 1:
+        data = _array.array('h', ((byte - 128) << 8 for byte in frames))
+    elif width == 2:
+        data = _array.array('h', frames)
+        if _sys.byteorder != 'little':
+            data.byteswap()
+    else:
+        raise ValueError('%d-byte samples are not supported' % width)
+    if channels > 1:
+        data = _array.array('h', (sum(data[index:index + channels]) // channels
+                                  for index in range(0, len(data), channels)))
+    if rate != RATE:
+        count = len(data) * RATE // rate
+        data = _array.array('h', (data[index * rate // RATE] for index in range(count)))
+    return Sample(data)
+
+def synthesize(beeps, volume=VOLUME):
+    'Return a Sample of (pause seconds, frequency, duration ms) beeps.'
+    data = _array.array('h')
+    for secs, frequency, duration in beeps:
+        data.frombytes(bytes(2 * round(secs * RATE)))
+        data.extend(_square(frequency, round(duration * RATE / 1000), volume))
+    return Sample(data)
+
+def player():
+    'Return the command of the first player that is installed or None.'
+    for command in PLAYERS:
+        if _shutil.which(command[0]):
+            return [argument.format(rate=RATE) for argument in command]
+    return None
+
+def default():
+    'Return the best backend that this system can play sounds with.'
+    if _winsound is not None:
+        return WinSound()
+    command = player()
+    if command is not None:
+        try:
+            pipe = Pipe(command)
+        except OSError:
+            pass
+        else:
+            # a player that cannot open a sound device exits at once
+            if pipe.alive(STARTUP):
+                return pipe
+            pipe.close()
+    return Null()
+
+################################################################################
+
+def _square(frequency, count, volume):
+    'Return count samples of a square wave.'
+    if frequency <= 0:
+        return _array.array('h', bytes(2 * count))
+    half = RATE / (2 * frequency)
+    return _array.array('h', (volume if int(index / half) % 2 == 0 else -volume
+                              for index in range(count)))
@@ -34,7 +34,7 @@ class Board:
 
 ################################################################################
 
-L1 = Board('Ladders & Floors', '''
+L1 = ('Ladders & Floors', '''
                                                      
                                                      
                                                      
@@ -51,7 +51,7 @@ L1 = Board('Ladders & Floors', '''
 
 ################################################################################
 
-L2 = Board('Zone 4', '''
+L2 = ('Zone 4', '''
                                                       
                                                       
                                                       
@@ -68,7 +68,7 @@ L2 = Board('Zone 4', '''
 
 ################################################################################
 
-L3 = Board('Rasputin\'s Domain', '''
+L3 = ('Rasputin\'s Domain', '''
                                                                        
 _______                         _*_|_*_                         _______
 |      __                _*___*_   |   _*___*_                __      |
@@ -88,7 +88,7 @@ _______                         _*_|_*_                         _______
 
 ################################################################################
 
-L4 = Board('House of Fire', '''
+L4 = ('House of Fire', '''
                                                                            
 |_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|
 |_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|_|
@@ -123,7 +123,7 @@ ___      _    _   _  _   _       _         ___           ___  _
 
 ################################################################################
 
-L5 = Board('Crazy Horse Lookout', '''
+L5 = ('Crazy Horse Lookout', '''
                                                    
                                                    
                                           ______   
@@ -154,7 +154,7 @@ L5 = Board('Crazy Horse Lookout', '''
 
 ################################################################################
 
-L6 = Board('Council of Earth', '''
+L6 = ('Council of Earth', '''
                                                        
                _________________________@              
               |                         |              
@@ -175,7 +175,7 @@ L6 = Board('Council of Earth', '''
 
 ################################################################################
 
-L7 = Board('Quicksilver', '''
+L7 = ('Quicksilver', '''
                              
  __*________*_ _________*___ 
  ____|_____*___ __@_|_*____* 
@@ -194,7 +194,7 @@ L7 = Board('Quicksilver', '''
 
 ################################################################################
 
-L8 = Board('Sound Stage', '''
+L8 = ('Sound Stage', '''
                                                                 
                                                                 
   _*__________*_|_*____*_  __________  _*____*_|_*__________*_  
@@ -228,7 +228,7 @@ L8 = Board('Sound Stage', '''
 
 ################################################################################
 
-L9 = Board('Christmas Cleanup', '''
+L9 = ('Christmas Cleanup', '''
                                                                      
                                   *                                  
                                 *_|_*                                
@@ -267,7 +267,7 @@ L9 = Board('Christmas Cleanup', '''
 
 ################################################################################
 
-L10 = Board('My Python', '''
+L10 = ('My Python', '''
                                 
  |____________________________| 
  |*_                     *_ *_| 
@@ -303,7 +303,7 @@ L10 = Board('My Python', '''
 
 ################################################################################
 
-L11 = Board('Tower of Babel', '''
+L11 = ('Tower of Babel', '''
                                                                      
              _*____*____*____*____@____*____*____*____*_             
              |                                         |             
@@ -343,7 +343,7 @@ L11 = Board('Tower of Babel', '''
 
 ################################################################################
 
-L12 = Board('Fix me!', '''
+L12 = ('Fix me!', '''
                                                                         
  |_*___      _|| _|_*_* ___ |  _  |  _|  _   _  ___  |  *_*_  _**___|   
  |**_ *   __||__| | |    __ *     | *__ | _ __ _|||_____|_   __|__ |    
@@ -384,4 +384,17 @@ L12 = Board('Fix me!', '''
 
 ################################################################################
 
-boards = L1, L2, L3, L4, L5, L6, L7, L8, L9, L10, L11, L12
+# The boards are kept as (name, text) and only checked by Board when they
+# are played (see levels.builtin), so importing this module parses nothing.
+
+texts = L1, L2, L3, L4, L5, L6, L7, L8, L9, L10, L11, L12
+
+# The boards tuple of checked Board objects that older code reads is built
+# the first time it is asked for.
+
+def __getattr__(name):
+    if name == 'boards':
+        global boards
+        boards = tuple(Board(*text) for text in texts)
+        return boards
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
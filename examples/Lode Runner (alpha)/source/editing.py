@@ -0,0 +1,117 @@
+#! /usr/bin/env python3
+'''Module for editing game videos.
+
+This module divides videos into scenes and merges videos together
+without needing Tk. Videos are read and written through streaming
+decompressors and compressors, so memory use stays the same no
+matter how long they are. It can also be run from the command line:
+
+    python -m source.editing split VIDEO [VIDEO ...]
+    python -m source.editing merge -o TARGET VIDEO [VIDEO ...]'''
+
+__version__ = '1.0'
+
+import argparse as _argparse
+import os as _os
+import sys as _sys
+
+from . import recording as _recording
+
+################################################################################
+
+def extension(filename):
+    'Return the lowercase extension of filename without the dot.'
+    return _os.path.splitext(filename)[1].lstrip('.').lower()
+
+def merged_extension(filenames):
+    'Return the extension that can hold all of the videos merged.'
+    extensions = set(map(extension, filenames))
+    for choice in 'gvc', 'gvb':
+        if choice in extensions:
+            return choice
+    return 'gva'
+
+def split(filename, directory=None, level=_recording.LEVEL):
+    'Write each scene of the video to its own file and return their names.'
+    if directory is None:
+        directory = _os.path.dirname(filename)
+    name, kind = _os.path.splitext(_os.path.basename(filename))
+    scenes = []
+    sink = current = None
+    with open(filename, 'rb') as source:
+        try:
+            for item in _recording.events(source):
+                if isinstance(item, tuple):
+                    # Sounds stay with the scene that they follow.
+                    if sink is not None:
+                        sink.sound(*item)
+                    continue
+                # A scene ends when the size of the board changes.
+                size = len(item), len(item[0])
+                if sink is None or size != current:
+                    current = size
+                    _close(sink)
+                    scenes.append(_os.path.join(directory, '%s-S%s%s' % (name, len(scenes) + 1, kind)))
+                    sink = _recording.recorder(open(scenes[-1], 'wb'), kind, level)
+                sink.frame(item)
+        finally:
+            _close(sink)
+    return scenes
+
+def merge(filenames, target, level=_recording.LEVEL):
+    'Write the videos one after the other into target.'
+    kind = extension(target)
+    with open(target, 'wb') as file:
+        sink = _recording.recorder(file, kind, level)
+        for filename in filenames:
+            with open(filename, 'rb') as source:
+                if kind != 'gvc' and not _recording.is_stream(source):
+                    # Legacy into legacy needs no unpickling at all.
+                    for data in _recording.legacy_chunks(source):
+                        sink.write(data)
+                    continue
+                for item in _recording.events(source):
+                    if isinstance(item, tuple):
+                        sink.sound(*item)
+                    else:
+                        sink.frame(item)
+        sink.close()
+
+################################################################################
+
+def main(argv=None):
+    'Split or merge videos from the command line.'
+    parser = _argparse.ArgumentParser(prog='python -m source.editing', description='Split or merge Lode Runner videos.')
+    parser.add_argument('-l', '--level', type=int, default=_recording.LEVEL, choices=range(10), metavar='0-9', help='compression level (default %d)' % _recording.LEVEL)
+    commands = parser.add_subparsers(dest='command')
+    command = commands.add_parser('split', help='write each scene of the videos to its own file')
+    command.add_argument('-d', '--directory', help='where the scenes are written (default: beside each video)')
+    command.add_argument('videos', nargs='+')
+    command = commands.add_parser('merge', help='write the videos one after the other into one file')
+    command.add_argument('-o', '--output', required=True, help='the merged video (.gva, .gvb, or .gvc)')
+    command.add_argument('videos', nargs='+')
+    args = parser.parse_args(argv)
+    if args.command == 'split':
+        for filename in args.videos:
+            for scene in split(filename, args.directory, args.level):
+                print(scene)
+    elif args.command == 'merge':
+        merge(args.videos, args.output, args.level)
+        print(args.output)
+    else:
+        parser.print_usage()
+        return 2
+    return 0
+
+################################################################################
+
+def _close(sink):
+    'Finish writing the recorder and close its file.'
+    if sink is not None:
+        sink.close()
+        sink.file.close()
+
+################################################################################
+
+if __name__ == '__main__':
+    _sys.exit(main())
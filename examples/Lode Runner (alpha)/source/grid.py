@@ -0,0 +1,72 @@
+#! /usr/bin/env python3
+'''Module for compact game boards.
+
+This module provides a grid of one-character cells kept in a flat
+bytearray, one row after another. A cell takes one byte instead of
+a list slot and a string object, and a whole grid can be copied
+with one slice assignment.'''
+
+__version__ = '1.0'
+
+################################################################################
+
+class Grid:
+
+    'Grid(rows, columns[, fill]) -> Grid'
+
+    __slots__ = 'rows', 'columns', 'data'
+
+    def __init__(self, rows, columns, fill=' '):
+        'Initialize the Grid object.'
+        self.rows = rows
+        self.columns = columns          # also the stride of a row
+        self.data = bytearray(fill.encode('latin-1') * (rows * columns))
+
+    @classmethod
+    def from_lines(cls, lines):
+        'Return a grid holding the lines of text (padded with spaces).'
+        lines = list(lines)
+        grid = cls(len(lines), max(map(len, lines)) if lines else 0)
+        for row, line in enumerate(lines):
+            start = row * grid.columns
+            grid.data[start:start + len(line)] = line.encode('latin-1')
+        return grid
+
+    def __repr__(self):
+        'Return the object\'s representation.'
+        return '%s.from_lines(%r)' % (type(self).__name__, self.lines())
+
+    def __eq__(self, other):
+        'Return whether the grids have the same size and cells.'
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return self.columns == other.columns and self.data == other.data
+
+    def __getitem__(self, position):
+        'Return the character at (row, column).'
+        row, column = position
+        if not (0 <= row < self.rows and 0 <= column < self.columns):
+            raise IndexError('%r is not on the grid' % (position,))
+        return chr(self.data[row * self.columns + column])
+
+    def __setitem__(self, position, character):
+        'Put the character at (row, column).'
+        row, column = position
+        if not (0 <= row < self.rows and 0 <= column < self.columns):
+            raise IndexError('%r is not on the grid' % (position,))
+        self.data[row * self.columns + column] = ord(character)
+
+    def copy(self):
+        'Return a new grid with the same cells.'
+        grid = type(self)(self.rows, self.columns)
+        grid.data[:] = self.data
+        return grid
+
+    def line(self, row):
+        'Return the row as a string.'
+        start = row * self.columns
+        return self.data[start:start + self.columns].decode('latin-1')
+
+    def lines(self):
+        'Return every row as a string.'
+        return [self.line(row) for row in range(self.rows)]
@@ -0,0 +1,187 @@
+#! /usr/bin/env python3
+'''Module for level packs.
+
+This module reads and writes level packs (.lrp), files that hold
+any number of boards. A pack starts with a header and an index of
+each board's name and where its rows are kept, so opening a pack
+only reads the index. A board is parsed and checked the first time
+it is asked for and kept in a small cache of the boards used most
+recently. The built-in boards are played through a pack built in
+memory, so they are loaded the same way. Packs can be built from
+the command line:
+
+    python -m source.levels build TARGET [FILE ...]
+    python -m source.levels list PACK
+
+With no files the boards in the boards module are packed. A board
+file holds the board's name on its first line and its rows below.'''
+
+__version__ = '1.0'
+
+import argparse as _argparse
+import collections as _collections
+import io as _io
+import struct as _struct
+import sys as _sys
+
+from . import boards as _boards
+
+################################################################################
+
+MAGIC = b'LRLP'             # starts a level pack
+VERSION = 1                 # version of the pack format
+CACHE = 8                   # boards kept parsed at a time
+
+_HEADER = _struct.Struct('<4sHI')       # magic, version, boards
+_ENTRY = _struct.Struct('<QIH')         # offset, length, length of name
+
+################################################################################
+
+class Pack:
+
+    '''Pack(file[, cache]) -> Pack
+
+    The pack is a sequence of boards.Board objects read from a
+    seekable binary file. Only the index is read when it is made;
+    each board is read, parsed, and checked when it is first looked
+    up, and the most recent cache boards are kept for next time.
+    Closing the pack (or leaving a with block) closes the file.'''
+
+    def __init__(self, file, cache=CACHE):
+        'Initialize the Pack object.'
+        self.file = file
+        self.cache = cache
+        self.loads = 0
+        file.seek(0)
+        magic, version, count = _HEADER.unpack(file.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError('not a level pack')
+        if version > VERSION:
+            raise ValueError('level pack version %d is not supported' % version)
+        self.__index = []
+        for number in range(count):
+            offset, length, size = _ENTRY.unpack(file.read(_ENTRY.size))
+            self.__index.append((file.read(size).decode(), offset, length))
+        self.__boards = _collections.OrderedDict()
+
+    def __len__(self):
+        'Return the number of boards.'
+        return len(self.__index)
+
+    def __getitem__(self, number):
+        'Return the board at number, parsing it if it is not cached.'
+        number = range(len(self.__index))[number]
+        if number in self.__boards:
+            self.__boards.move_to_end(number)
+        else:
+            self.__boards[number] = _boards.Board(*self.text(number))
+            self.loads += 1
+            while len(self.__boards) > self.cache:
+                self.__boards.popitem(False)
+        return self.__boards[number]
+
+    def names(self):
+        'Return the names of the boards.'
+        return [name for name, offset, length in self.__index]
+
+    def text(self, number):
+        'Return (name, text) of the board at number without checking it.'
+        name, offset, length = self.__index[number]
+        self.file.seek(offset)
+        return name, self.file.read(length).decode()
+
+    def close(self):
+        'Close the file.'
+        self.file.close()
+
+    def __enter__(self):
+        'Return the pack.'
+        return self
+
+    def __exit__(self, *exc_info):
+        'Close the pack.'
+        self.close()
+
+################################################################################
+
+def is_pack(file):
+    'Return whether the seekable file holds a level pack.'
+    start = file.tell()
+    magic = file.read(len(MAGIC))
+    file.seek(start)
+    return magic == MAGIC
+
+def open_pack(filename, cache=CACHE):
+    'Return the Pack in the named file.'
+    return Pack(open(filename, 'rb'), cache)
+
+def builtin(cache=CACHE):
+    'Return a Pack of the boards in the boards module.'
+    file = _io.BytesIO()
+    write(file, _boards.texts)
+    return Pack(file, cache)
+
+def write(file, boards):
+    'Write the (name, text) boards to the binary file as a pack.'
+    boards = [(name.encode(), text.encode()) for name, text in boards]
+    offset = _HEADER.size + sum(_ENTRY.size + len(name) for name, text in boards)
+    file.write(_HEADER.pack(MAGIC, VERSION, len(boards)))
+    for name, text in boards:
+        file.write(_ENTRY.pack(offset, len(text), len(name)) + name)
+        offset += len(text)
+    for name, text in boards:
+        file.write(text)
+
+def read_board(filename):
+    'Return (name, text) of the board in a board file.'
+    with open(filename) as file:
+        name, *rows = file.read().splitlines()
+    while rows and not rows[-1].strip():
+        rows.pop()
+    return name, '\n' + '\n'.join(rows)
+
+def read(filename):
+    'Return [(name, text), ...] of the boards in a pack or board file.'
+    with open(filename, 'rb') as file:
+        if is_pack(file):
+            pack = Pack(file)
+            return [pack.text(number) for number in range(len(pack))]
+    return [read_board(filename)]
+
+################################################################################
+
+def main(argv=None):
+    'Build or list level packs from the command line.'
+    parser = _argparse.ArgumentParser(prog='python -m source.levels', description='Build and list Lode Runner level packs.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+    build = commands.add_parser('build', help='pack boards into a level pack')
+    build.add_argument('target', metavar='TARGET', help='level pack to write')
+    build.add_argument('files', nargs='*', metavar='FILE', help='board files or packs (default: the built-in boards)')
+    show = commands.add_parser('list', help='list the boards in a level pack')
+    show.add_argument('pack', metavar='PACK', help='level pack to read')
+    args = parser.parse_args(argv)
+    if args.command == 'build':
+        if args.files:
+            boards = [board for filename in args.files for board in read(filename)]
+        else:
+            boards = list(_boards.texts)
+        for name, text in boards:
+            try:
+                _boards.Board(name, text)
+            except AssertionError:
+                print('%s: bad name, characters, row widths, or portal count' % name, file=_sys.stderr)
+                return 1
+        with open(args.target, 'wb') as file:
+            write(file, boards)
+        print('%d boards written to %s' % (len(boards), args.target))
+    else:
+        with open_pack(args.pack) as pack:
+            for number, name in enumerate(pack.names(), 1):
+                print('%d. %s' % (number, name))
+    return 0
+
+################################################################################
+
+if __name__ == '__main__':
+    _sys.exit(main())
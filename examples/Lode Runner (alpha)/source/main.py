@@ -1,213 +1,35 @@
 #! /usr/bin/env python3
-from . import boards
+from . import levels
+from . import recording
+from . import rules
 from . import sounds
 from . import util
 import random
+import shutil
 import tempfile
 import tkinter.filedialog
 import tkinter.messagebox
-import zlib
 
 ################################################################################
 
-class Player:
-
-    def __init__(self, screen, face, row=1, column=10):
-        self.screen = screen
-        self.face = face
-        self.row = row
-        self.column = column
-        self.vector = 0, 0
-
-    def move(self):
-        global playing, you, players
-        context = self.screen.read(self.row, self.column)
-        left = self.screen.read(self.row, self.column - 1)
-        right = self.screen.read(self.row, self.column + 1)
-        x, y = self.vector
-        x_move = False
-        # if on the floor
-        if context == '_' or context == '*':
-            self.column += x
-            x_move = True
-        # if on transporter
-        elif context == '@':
-            if left is not None and left in '_*|' and x == -1:
-                self.column += x
-            elif right is not None and right in '_*|' and x == 1:
-                self.column += x
-            else:
-                if self.screen.read(self.row + 1, self.column) == '|' and y == 1:
-                    self.row += y
-                elif self.screen.read(self.row - 1, self.column) == '|' and y == -1:
-                    self.row += y
-                else:
-                    self.row += 1
-        # if on a ladder
-        elif context == '|':
-            self.row += y
-        # if in the air
-        elif context == ' ':
-            if self.screen.read(self.row + 1, self.column) != '|' or y == 1:
-                # you may go down a ladder or fall
-                self.row += 1
-            else:
-                # you may jump off a ladder
-                self.column += x
-        # you may get off a ladder
-        if not x_move and context != ' ':
-            if left is not None and left in '_*' and x == -1:
-                self.column += x
-            elif right is not None and right in '_*' and x == 1:
-                self.column += x
-        # show the new position
-        self.screen.write(self.row, self.column, self.face)
-        # if off the screen
-        if self.screen.read(self.row, self.column) is None:
-            if self is you:
-                # kill the game
-                playing = False
-            else:
-                # kill the robot
-                players.remove(self)
-                sound.play('kill')
-        # if at a teleporter
-        elif self.screen.cache_read(self.row, self.column) == '@':
-            first, second = self.screen.find('@')
-            if first[0] == self.row and first[1] == self.column:
-                # transfer to second teleporter
-                self.row, self.column = second
-            else:
-                # goto first teleporter
-                self.row, self.column = first
-            # show the new position as well
-            self.screen.write(self.row, self.column, self.face)
-            # play a sound
-            sound.play('zip')
-
-################################################################################
-
-class You(Player):
-
-    def __init__(self, screen, face, row=0, column=10):
-        Player.__init__(self, screen, face, row, column)
-        self.score = 0
-
-    def setDirection(self, command): # REVISED - V7
-        context = self.screen.read(self.row, self.column)
-        if context == '*':
-            self.score += 10
-            self.screen.cache_write(self.row, self.column, '_')
-            sound.play('score')
-        if command == 'up':
-            self.vector = 0, -1
-        elif command == 'down':
-            self.vector = 0, +1
-        elif command == 'left':
-            self.vector = -1, 0
-        elif command == 'right':
-            self.vector = +1, 0
-        elif command == 'stop':       # NEW - V7
-            self.vector = 0, 0
-        elif command == 'cut_left':
-            if self.screen.cache_read(self.row, self.column - 1) != '@':
-                self.screen.cache_write(self.row, self.column - 1, ' ')
-        elif command == 'cut_right':
-            if self.screen.cache_read(self.row, self.column + 1) != '@':
-                self.screen.cache_write(self.row, self.column + 1, ' ')
-
-class Robot(Player):
-
-    def __init__(self, screen, face, row=0, column=10):
-        Player.__init__(self, screen, face, row, column)
-        self.move_count = 0
-
-    def move(self):
-        if self.screen.read(self.row, self.column) == ' ':
-            Player.move(self)
-        else:
-            self.move_count += 1
-            if self.move_count % 2:
-                Player.move(self)
-            else:
-                self.screen.write(self.row, self.column, self.face)
-
-    def setDirection(self, key):
-        global playing, you
-        # The robot caught you (player).
-        if you.row == self.row and you.column == self.column:
-            playing = False
-        # Change columns (horizontal direction) if needed.
-        if self.column > you.column:
-            self.vector = -1, 0
-        elif self.column < you.column:
-            self.vector = +1, 0
-        # Changing rows (height) takes priority.
-        if self.row != you.row:
-            context = self.screen.read(self.row, self.column)
-            below = self.screen.read(self.row + 1, self.column) or ''
-            if context == '|' or (below == '|' and context not in '_*' and self.row < you.row):
-                # You are higher -- robot goes up.
-                if self.row > you.row:
-                    self.vector = 0, -1
-                # There is a floor, load, ladder, or portal under the robot
-                # -- or you are under the robot -- the robot goes down.
-                elif below in '_*|@' or self.column == you.column:
-                    self.vector = 0, +1
-                else:
-                    # Find out if there is anything to land on.
-                    look_down = 2
-                    eye = self.screen.read(self.row + look_down, self.column)
-                    while eye and eye not in '_*|@':
-                        look_down += 1
-                        eye = self.screen.read(self.row + look_down, self.column)
-                    # If so, go through with "jumping" down.
-                    if eye and eye in '_*|@':
-                        self.vector = 0, +1
-
-################################################################################
-
-ROBOTS = 3
-
 def check():
-    return run and playing
+    return game.check()
 
 def callback():
-    global clock, screen, win_condition, run, keys, note
-    clock += 1
-    if clock > 40 and len(players) - 1 < ROBOTS:
-        players.append(Robot(screen, '&', column=random.randrange(width))) # NEW - V6
+    global keys
     key = keys
     keys = ''
-    for player in players:
-        player.setDirection(key)
-        player.move()
-    screen.update()
-    if you.score == win_condition:
-        run = False
-    if note:
-        sound.play('move_high')
-    else:
-        sound.play('move_low')
-    note = not note
+    game.step(key)
 
 def dispatch(string, event=None):
     global keys
     keys += string
 
 def engine(SELECT):
-    global playing, you, players, clock, screen, win_condition, run, keys, note, width
+    global game, keys
     keys = ''
-    run = True
-    screen = util.Screen3(boards.boards[SELECT], callback, check, dispatch, root)
-    width = len(boards.boards[SELECT].board().splitlines()[1]) # NEW - V6
-    win_condition = boards.boards[SELECT].board().count('*') * 10
-    you = You(screen, '^')
-    screen.update()
-    players = [you]
-    clock = 0
-    playing = True
-    note = False
+    screen = util.Screen3(LEVELS[SELECT], callback, check, dispatch, root)
+    game = rules.Game(screen, random, sound.play)
     # Game Loop
     try:
         screen.root.mainloop()
@@ -219,7 +41,7 @@ def engine(SELECT):
             raise
     # End Game Loop
     screen.update()
-    if you.score == win_condition:
+    if game.won:
         sound.play('win', True)
     else:
         sound.play('lose', True)
@@ -309,34 +131,50 @@ class DummyFile: # Create a fake file.
 def main():
     select_theme()
     load_images()
+    select_levels()
     history = setup_save()
     load_sounds(history)
     try:
-        for SELECT in range(len(boards.boards)):
+        for SELECT in range(len(LEVELS)):
             engine(SELECT)
     finally:
+        LEVELS.close()
         save_game_play()
 
+def select_levels():
+    global LEVELS
+    # boards are only read when engine asks for them
+    LEVELS = None
+    # Find out if the user wishes to play a level pack.
+    if tkinter.messagebox.askyesno('Levels', 'Do you want to play a level pack?'):
+        filename = tkinter.filedialog.askopenfilename(title='Open Level Pack', filetypes=['Levels .lrp'])
+        if filename:
+            LEVELS = levels.open_pack(filename)
+    if LEVELS is None:
+        LEVELS = levels.builtin()
+
 def setup_save():
     # Find out if the user wishes to save a video.
     if tkinter.messagebox.askyesno('Video', 'Do you want to record your game?'):
-        util.Screen3.HISTORY = tempfile.TemporaryFile()
+        util.Screen3.HISTORY = recording.Recorder(tempfile.TemporaryFile())
     else:
         util.Screen3.HISTORY = DummyFile()
     return util.Screen3.HISTORY
 
 def save_game_play():
     if not isinstance(util.Screen3.HISTORY, DummyFile):
-        # get and close buffer
-        util.Screen3.HISTORY.seek(0)
-        value = util.Screen3.HISTORY.read()
-        util.Screen3.HISTORY.close()
+        # finish the recording (it is already compressed)
+        history = util.Screen3.HISTORY
+        history.close()
         # only process buffer if it has data
-        if value:
+        if history.frames:
             # get the filename
-            filename = tkinter.filedialog.asksaveasfilename(title='Save Video As', filetypes=['Audio/Video .gvb'])
+            filename = tkinter.filedialog.asksaveasfilename(title='Save Video As', filetypes=['Stream Video .gvc'])
             if filename:
                 # clean the filename
-                if not filename.lower().endswith('.gvb'):
-                    filename += '.gvb'
-                open(filename, 'wb').write(zlib.compress(value, 9))
+                if not filename.lower().endswith('.gvc'):
+                    filename += '.gvc'
+                history.file.seek(0)
+                with open(filename, 'wb') as video:
+                    shutil.copyfileobj(history.file, video)
+        history.file.close()
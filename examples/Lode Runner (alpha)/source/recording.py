@@ -0,0 +1,381 @@
+#! /usr/bin/env python3
+'''Module for game video recordings.
+
+This module reads and writes the videos that Lode Runner records.
+A video is a series of frames (rows of (environment, actor) keys)
+with sound requests, given as (name, block) tuples, between them.
+
+Streaming videos (.gvc) start with a header giving their version.
+They are cut into segments that are each compressed on their own
+and begin with a keyframe holding every cell; the frames after it
+only hold the cells that changed. An index of the keyframes at the
+end of the file lets a player start at any segment without reading
+the ones before it. Legacy videos (.gva and .gvb) are one zlib
+stream of pickled frames and sound tuples; they are unpickled as
+they are decompressed, and seeking in them needs a sidecar index.'''
+
+__version__ = '1.0'
+
+import io as _io
+import os as _os
+import pickle as _pickle
+import struct as _struct
+import zlib as _zlib
+
+################################################################################
+
+MAGIC = b'LRGV'             # starts a streaming video
+VERSION = 1                 # version of the streaming format
+INTERVAL = 240              # frames between keyframes (30 seconds)
+LEVEL = 9                   # compression level
+CHUNK = 1 << 16             # bytes read at a time
+SIDECAR = '.gvi'            # added to a legacy video's name for its index
+
+_HEADER = _struct.Struct('<4sHH')       # magic, version, interval
+_KEY = _struct.Struct('<cHH')           # b'K', height, width
+_DELTA = _struct.Struct('<cH')          # b'D', cells
+_CELL = _struct.Struct('<HH2s')         # row, column, keys
+_SOUND = _struct.Struct('<c?H')         # b'S', block, length of name
+_ENTRY = _struct.Struct('<IQ')          # frame, offset
+_INDEX = b'LRGI'                        # starts the keyframe index
+_TRAILER = _struct.Struct('<QI4s')      # index offset, frames, b'LRGE'
+_END = b'LRGE'
+
+################################################################################
+
+class Recorder:
+
+    '''Recorder(file[, interval[, level]]) -> Recorder
+
+    The recorder writes a streaming video to a binary file as it is
+    played. Frames may be given with the cells that could have
+    changed since the previous frame; otherwise every cell is
+    compared. Sounds requested before the first frame are kept and
+    written at the start of its segment. The video is only complete
+    once close is called.'''
+
+    def __init__(self, file, interval=INTERVAL, level=LEVEL):
+        'Initialize the Recorder object.'
+        self.file = file
+        self.interval = interval
+        self.level = level
+        self.frames = 0
+        self.__index = []
+        self.__grid = None
+        self.__zip = None
+        self.__sounds = []
+        file.write(_HEADER.pack(MAGIC, VERSION, interval))
+
+    def frame(self, grid, cells=None):
+        'Record the frame, checking only cells if they are given.'
+        if self.__grid is None or len(grid) != len(self.__grid) or \
+           len(grid[0]) != len(self.__grid[0]) or \
+           self.frames - self.__index[-1][0] >= self.interval:
+            self.__keyframe(grid)
+        else:
+            if cells is None:
+                cells = ((row, column) for row in range(len(grid)) for column in range(len(grid[0])))
+            changed = []
+            for row, column in cells:
+                cell = grid[row][column]
+                if self.__grid[row][column] != cell:
+                    self.__grid[row][column] = cell
+                    changed.append(_CELL.pack(row, column, _pack(cell)))
+            self.__write(_DELTA.pack(b'D', len(changed)) + b''.join(changed))
+        self.frames += 1
+
+    def sound(self, name, block=False):
+        'Record a request to play a sound.'
+        name = name.encode()
+        data = _SOUND.pack(b'S', block, len(name)) + name
+        if self.__zip is None:
+            self.__sounds.append(data)
+        else:
+            self.__write(data)
+
+    def close(self):
+        'Finish the last segment and write the keyframe index.'
+        if self.__zip is not None:
+            self.file.write(self.__zip.flush())
+            self.__zip = None
+        offset = self.file.tell()
+        self.file.write(_INDEX + _struct.pack('<I', len(self.__index)))
+        self.file.write(b''.join(_ENTRY.pack(*entry) for entry in self.__index))
+        self.file.write(_TRAILER.pack(offset, self.frames, _END))
+        self.file.flush()
+
+    def __keyframe(self, grid):
+        'Private class method.'
+        if self.__zip is not None:
+            self.file.write(self.__zip.flush())
+        self.__index.append((self.frames, self.file.tell()))
+        self.__zip = _zlib.compressobj(self.level)
+        if self.__sounds:
+            self.__write(b''.join(self.__sounds))
+            self.__sounds = []
+        self.__grid = [list(row) for row in grid]
+        cells = b''.join(_pack(cell) for row in grid for cell in row)
+        self.__write(_KEY.pack(b'K', len(grid), len(grid[0])) + cells)
+
+    def __write(self, data):
+        'Private class method.'
+        self.file.write(self.__zip.compress(data))
+
+################################################################################
+
+class Reader:
+
+    '''Reader(file) -> Reader
+
+    The reader plays back a streaming video from a seekable binary
+    file. Iterating over it (or over events) yields each frame and
+    sound tuple in turn. A frame is the same list of rows each time,
+    updated in place; changed holds the cells that the last frame
+    changed, or None after a keyframe.'''
+
+    def __init__(self, file):
+        'Initialize the Reader object.'
+        self.file = file
+        file.seek(0)
+        magic, version, self.interval = _HEADER.unpack(file.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError('not a streaming video')
+        if version > VERSION:
+            raise ValueError('video format version %d is not supported' % version)
+        self.index, self.frames = _read_index(file)
+        self.changed = None
+
+    def __iter__(self):
+        'Return an iterator over the whole video.'
+        return self.events()
+
+    def events(self, frame=0):
+        'Yield the frames and sounds from frame onward.'
+        offset, number = _HEADER.size, 0
+        for first, start in self.index:
+            if first <= frame:
+                offset, number = start, first
+        self.file.seek(offset)
+        grid = None
+        for segment in _segments(self.file):
+            position = 0
+            while position < len(segment):
+                kind = segment[position:position + 1]
+                if kind == b'K':
+                    kind, height, width = _KEY.unpack_from(segment, position)
+                    position += _KEY.size
+                    cells = [_unpack(segment[index:index + 2]) for index in range(position, position + height * width * 2, 2)]
+                    position += height * width * 2
+                    grid = [cells[row * width:row * width + width] for row in range(height)]
+                    self.changed = None
+                elif kind == b'D':
+                    kind, count = _DELTA.unpack_from(segment, position)
+                    position += _DELTA.size
+                    self.changed = []
+                    for cell in range(count):
+                        row, column, keys = _CELL.unpack_from(segment, position)
+                        position += _CELL.size
+                        grid[row][column] = _unpack(keys)
+                        self.changed.append((row, column))
+                elif kind == b'S':
+                    kind, block, length = _SOUND.unpack_from(segment, position)
+                    position += _SOUND.size
+                    name = segment[position:position + length].decode()
+                    position += length
+                    if number > frame or not frame:
+                        yield name, block
+                    continue
+                else:
+                    raise ValueError('damaged video segment')
+                number += 1
+                if number > frame:
+                    yield grid
+
+################################################################################
+
+class LegacyRecorder:
+
+    '''LegacyRecorder(file[, level]) -> LegacyRecorder
+
+    The legacy recorder writes the pickled frames and sound tuples
+    of a .gva or .gvb video through a streaming compressor, so the
+    video is never held in memory as a whole.'''
+
+    def __init__(self, file, level=LEVEL):
+        'Initialize the LegacyRecorder object.'
+        self.file = file
+        self.frames = 0
+        self.__zip = _zlib.compressobj(level)
+
+    def frame(self, grid, cells=None):
+        'Record the frame.'
+        self.file.write(self.__zip.compress(_pickle.dumps(grid, -1)))
+        self.frames += 1
+
+    def sound(self, name, block=False):
+        'Record a request to play a sound.'
+        self.file.write(self.__zip.compress(_pickle.dumps((name, block), -1)))
+
+    def write(self, data):
+        'Record data holding frames and sounds that are already pickled.'
+        self.file.write(self.__zip.compress(data))
+
+    def close(self):
+        'Finish the compressed stream.'
+        self.file.write(self.__zip.flush())
+        self.file.flush()
+
+################################################################################
+
+def is_stream(file):
+    'Return whether the seekable file holds a streaming video.'
+    start = file.tell()
+    magic = file.read(len(MAGIC))
+    file.seek(start)
+    return magic == MAGIC
+
+def events(file):
+    'Yield the frames and sounds of a streaming or legacy video.'
+    if is_stream(file):
+        return iter(Reader(file))
+    return legacy_events(file)
+
+def legacy_chunks(file):
+    'Yield the decompressed contents of a legacy video a chunk at a time.'
+    unzip = _zlib.decompressobj()
+    while not unzip.eof:
+        data = file.read(CHUNK)
+        if not data:
+            break
+        yield unzip.decompress(data)
+
+def legacy_events(file):
+    'Yield the frames and sounds of a legacy video as it is read.'
+    unzip = _zlib.decompressobj()
+    buffer = _io.BytesIO()
+    while True:
+        start = buffer.tell()
+        try:
+            item = _pickle.load(buffer)
+        except (EOFError, _pickle.UnpicklingError):
+            # The next item is not all there; decompress some more.
+            data = file.read(CHUNK)
+            more = unzip.decompress(data) if data else unzip.flush()
+            if not more and not data:
+                return
+            buffer = _io.BytesIO(buffer.getvalue()[start:] + more)
+        else:
+            yield item
+
+def recorder(file, extension, level=LEVEL):
+    'Return a recorder for a video with the given extension.'
+    if extension.lower().lstrip('.') == 'gvc':
+        return Recorder(file, level=level)
+    return LegacyRecorder(file, level)
+
+def transcode(source, target):
+    'Write the video in source to target as a streaming video.'
+    sink = Recorder(target)
+    for item in events(source):
+        if isinstance(item, tuple):
+            sink.sound(*item)
+        else:
+            sink.frame(item)
+    sink.close()
+    return sink
+
+def load_index(filename, build=False):
+    '''Return a Reader that can seek in the video or None.
+
+    Streaming videos carry their own index. Legacy videos can only
+    be read from the start, so they may have a sidecar file holding
+    the same video as a streaming one; it is built if asked for and
+    rebuilt whenever the video is newer.'''
+    with open(filename, 'rb') as file:
+        if is_stream(file):
+            return Reader(open(filename, 'rb'))
+        sidecar = filename + SIDECAR
+        if not _os.path.exists(sidecar) or _os.path.getmtime(sidecar) < _os.path.getmtime(filename):
+            if not build:
+                return None
+            with open(sidecar + '.tmp', 'wb') as target:
+                transcode(file, target)
+            _os.replace(sidecar + '.tmp', sidecar)
+    return Reader(open(sidecar, 'rb'))
+
+################################################################################
+
+def _pack(cell):
+    'Return the two bytes that stand for the (environment, actor) keys.'
+    env, act = cell
+    return (env + (act or '\0')).encode('latin-1')
+
+def _unpack(keys):
+    'Return the (environment, actor) keys that the two bytes stand for.'
+    env, act = keys.decode('latin-1')
+    return env, (None if act == '\0' else act)
+
+def _read_index(file):
+    'Return the keyframe index and frame count or a rebuilt index.'
+    file.seek(0, 2)
+    size = file.tell()
+    if size >= _HEADER.size + _TRAILER.size:
+        file.seek(size - _TRAILER.size)
+        offset, frames, end = _TRAILER.unpack(file.read(_TRAILER.size))
+        if end == _END and _HEADER.size <= offset < size:
+            file.seek(offset)
+            if file.read(len(_INDEX)) == _INDEX:
+                count, = _struct.unpack('<I', file.read(4))
+                data = file.read(count * _ENTRY.size)
+                return [_ENTRY.unpack_from(data, index * _ENTRY.size) for index in range(count)], frames
+    # The recording was cut short; scan the segments that were written.
+    index, frames = [], 0
+    file.seek(_HEADER.size)
+    for offset, segment in _segments(file, True):
+        index.append((frames, offset))
+        frames += _count(segment)
+    return index, frames
+
+def _segments(file, offsets=False):
+    'Yield each segment from the file position to the index.'
+    pending = b''
+    offset = file.tell()
+    while True:
+        if len(pending) < len(_INDEX):
+            pending += file.read(CHUNK)
+        if not pending or pending.startswith(_INDEX):
+            return
+        unzip = _zlib.decompressobj()
+        output = []
+        used = 0
+        while not unzip.eof:
+            if not pending:
+                pending = file.read(CHUNK)
+                if not pending:
+                    return      # the last segment is incomplete
+            output.append(unzip.decompress(pending))
+            used += len(pending) - len(unzip.unused_data)
+            pending = unzip.unused_data
+        segment = b''.join(output)
+        yield (offset, segment) if offsets else segment
+        offset += used
+
+def _count(segment):
+    'Return the number of frames in the segment.'
+    frames = position = 0
+    while position < len(segment):
+        kind = segment[position:position + 1]
+        if kind == b'K':
+            kind, height, width = _KEY.unpack_from(segment, position)
+            position += _KEY.size + height * width * 2
+        elif kind == b'D':
+            kind, count = _DELTA.unpack_from(segment, position)
+            position += _DELTA.size + count * _CELL.size
+        elif kind == b'S':
+            kind, block, length = _SOUND.unpack_from(segment, position)
+            position += _SOUND.size + length
+            continue
+        else:
+            break
+        frames += 1
+    return frames
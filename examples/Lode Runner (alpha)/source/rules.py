@@ -0,0 +1,541 @@
+#! /usr/bin/env python3
+'''Module for the rules of Lode Runner.
+
+This module steps a game one tick at a time without Tk or globals.
+A Field holds the board: the environment (floors, loads, ladders,
+and portals) and the actors drawn over it until the next update.
+A Game moves you and the robots over any screen that acts like a
+Field, so the same rules drive the window and headless runs, and a
+Navigator finds the robots' shortest paths to you. It can be run
+to time random games on every board:
+
+    python -m source.rules [-t TICKS] [-s SEED]'''
+
+__version__ = '1.0'
+
+import argparse as _argparse
+import random as _random
+import sys as _sys
+import time as _time
+
+from . import grid as _grid
+
+################################################################################
+
+ROBOTS = 3      # robots on the board at once
+SPAWN = 40      # ticks before robots start to appear
+SCORE = 10      # points for each load
+COMMANDS = 'up', 'down', 'left', 'right', 'stop', 'cut_left', 'cut_right'
+
+################################################################################
+
+class Field:
+
+    '''Field(lines[, history]) -> Field
+
+    The field keeps the environment in cache and the environment
+    with the actors written over it in temp. Cells that are written
+    are remembered in dirty; update puts back the environment under
+    them, leaving dirty holding the cells that it changed. Where each
+    kind of cell is gets indexed as the environment changes, and the
+    functions given to watch are called with the (row, column) of
+    each change. If a history (such as a recording.Recorder) is
+    given, each update first hands it the frame with the actors.'''
+
+    def __init__(self, lines, history=None):
+        'Initialize the Field object.'
+        self.history = history
+        self.cache = _grid.Grid.from_lines(lines)
+        self.temp = self.cache.copy()
+        self.height = self.cache.rows
+        self.width = self.cache.columns
+        self.dirty = set((row, column) for row in range(self.height) for column in range(self.width))
+        self.__places = {}
+        self.__watchers = []
+        for row, line in enumerate(self.cache.lines()):
+            for column, key in enumerate(line):
+                self.__place(row, column, key)
+
+    @classmethod
+    def from_board(cls, board, history=None):
+        'Return a field holding one of the boards in the boards module.'
+        return cls(board.board().splitlines()[1:], history)
+
+    def read(self, row, column):
+        'Return the cell (actor or environment) or None if off the board.'
+        if 0 <= row < self.height and 0 <= column < self.width:
+            return self.temp[row, column]
+
+    def write(self, row, column, character):
+        'Draw the character on the cell until the next update.'
+        if 0 <= row < self.height and 0 <= column < self.width:
+            self.temp[row, column] = character[0]
+            self.dirty.add((row, column))
+
+    def cache_read(self, row, column):
+        'Return the environment of the cell or None if off the board.'
+        if 0 <= row < self.height and 0 <= column < self.width:
+            return self.cache[row, column]
+
+    def cache_write(self, row, column, character):
+        'Change the environment of the cell.'
+        if 0 <= row < self.height and 0 <= column < self.width:
+            self.__unplace(row, column, self.cache[row, column])
+            self.cache[row, column] = character[0]
+            self.__place(row, column, character[0])
+            self.write(row, column, character)
+            for watcher in self.__watchers:
+                watcher(row, column)
+
+    def watch(self, watcher):
+        'Call watcher(row, column) whenever the environment changes.'
+        self.__watchers.append(watcher)
+
+    def find(self, char):
+        'Return the (row, column) of each cell holding char from the top left.'
+        return sorted(self.__places.get(char, ()))
+
+    def count(self, char):
+        'Return the number of cells holding char.'
+        return len(self.__places.get(char, ()))
+
+    def update(self):
+        'Put back the environment under everything written since the last update.'
+        if self.history is not None:
+            self.history.frame(self.frame(), self.dirty)
+        reverted = set()
+        for row, column in self.dirty:
+            if self.temp[row, column] != self.cache[row, column]:
+                self.temp[row, column] = self.cache[row, column]
+                reverted.add((row, column))
+        self.dirty = reverted
+
+    def frame(self):
+        'Return the [(environment, actor), ...] rows that videos record.'
+        return [[(env, act if act in '^&' else None) for env, act in zip(self.cache.line(row), self.temp.line(row))]
+                for row in range(self.height)]
+
+    def __place(self, row, column, key):
+        'Private class method.'
+        self.__places.setdefault(key, set()).add((row, column))
+
+    def __unplace(self, row, column, key):
+        'Private class method.'
+        self.__places[key].discard((row, column))
+
+################################################################################
+
+class Player:
+
+    'Player(game, face[, row[, column]]) -> Player'
+
+    def __init__(self, game, face, row=1, column=10):
+        'Initialize the Player object.'
+        self.game = game
+        self.screen = game.screen
+        self.face = face
+        self.row = row
+        self.column = column
+        self.vector = 0, 0
+
+    def move(self):
+        'Move one cell along the vector if the board allows it.'
+        context = self.screen.read(self.row, self.column)
+        left = self.screen.read(self.row, self.column - 1)
+        right = self.screen.read(self.row, self.column + 1)
+        x, y = self.vector
+        x_move = False
+        # if on the floor
+        if context == '_' or context == '*':
+            self.column += x
+            x_move = True
+        # if on transporter
+        elif context == '@':
+            if left is not None and left in '_*|' and x == -1:
+                self.column += x
+            elif right is not None and right in '_*|' and x == 1:
+                self.column += x
+            else:
+                if self.screen.read(self.row + 1, self.column) == '|' and y == 1:
+                    self.row += y
+                elif self.screen.read(self.row - 1, self.column) == '|' and y == -1:
+                    self.row += y
+                else:
+                    self.row += 1
+        # if on a ladder
+        elif context == '|':
+            self.row += y
+        # if in the air
+        elif context == ' ':
+            if self.screen.read(self.row + 1, self.column) != '|' or y == 1:
+                # you may go down a ladder or fall
+                self.row += 1
+            else:
+                # you may jump off a ladder
+                self.column += x
+        # you may get off a ladder
+        if not x_move and context != ' ':
+            if left is not None and left in '_*' and x == -1:
+                self.column += x
+            elif right is not None and right in '_*' and x == 1:
+                self.column += x
+        # show the new position
+        self.screen.write(self.row, self.column, self.face)
+        # if off the screen
+        if self.screen.read(self.row, self.column) is None:
+            if self is self.game.you:
+                # kill the game
+                self.game.playing = False
+            else:
+                # kill the robot
+                self.game.players.remove(self)
+                self.game.play('kill')
+        # if at a teleporter
+        elif self.screen.cache_read(self.row, self.column) == '@':
+            first, second = self.screen.find('@')
+            if first[0] == self.row and first[1] == self.column:
+                # transfer to second teleporter
+                self.row, self.column = second
+            else:
+                # goto first teleporter
+                self.row, self.column = first
+            # show the new position as well
+            self.screen.write(self.row, self.column, self.face)
+            # play a sound
+            self.game.play('zip')
+
+class You(Player):
+
+    'You(game, face[, row[, column]]) -> You'
+
+    def __init__(self, game, face, row=0, column=10):
+        'Initialize the You object.'
+        Player.__init__(self, game, face, row, column)
+        self.score = 0
+
+    def setDirection(self, command):
+        'Pick up a load under you and follow the command.'
+        context = self.screen.read(self.row, self.column)
+        if context == '*':
+            self.score += SCORE
+            self.screen.cache_write(self.row, self.column, '_')
+            self.game.play('score')
+        if command == 'up':
+            self.vector = 0, -1
+        elif command == 'down':
+            self.vector = 0, +1
+        elif command == 'left':
+            self.vector = -1, 0
+        elif command == 'right':
+            self.vector = +1, 0
+        elif command == 'stop':
+            self.vector = 0, 0
+        elif command == 'cut_left':
+            if self.screen.cache_read(self.row, self.column - 1) != '@':
+                self.screen.cache_write(self.row, self.column - 1, ' ')
+        elif command == 'cut_right':
+            if self.screen.cache_read(self.row, self.column + 1) != '@':
+                self.screen.cache_write(self.row, self.column + 1, ' ')
+
+class Robot(Player):
+
+    'Robot(game, face[, row[, column]]) -> Robot'
+
+    def __init__(self, game, face, row=0, column=10):
+        'Initialize the Robot object.'
+        Player.__init__(self, game, face, row, column)
+        self.move_count = 0
+
+    def move(self):
+        'Move at half speed except when falling.'
+        if self.screen.read(self.row, self.column) == ' ':
+            Player.move(self)
+        else:
+            self.move_count += 1
+            if self.move_count % 2:
+                Player.move(self)
+            else:
+                self.screen.write(self.row, self.column, self.face)
+
+    def setDirection(self, key):
+        'Catch you or head toward you.'
+        you = self.game.you
+        # The robot caught you (player).
+        if you.row == self.row and you.column == self.column:
+            self.game.playing = False
+        # Follow the shortest path to you if there is one.
+        if self.game.navigator is not None:
+            vector = self.game.navigator.direction(self.row, self.column, (you.row, you.column))
+            if vector is not None:
+                self.vector = vector
+                return
+        # Change columns (horizontal direction) if needed.
+        if self.column > you.column:
+            self.vector = -1, 0
+        elif self.column < you.column:
+            self.vector = +1, 0
+        # Changing rows (height) takes priority.
+        if self.row != you.row:
+            context = self.screen.read(self.row, self.column)
+            below = self.screen.read(self.row + 1, self.column) or ''
+            if context == '|' or (below == '|' and context not in '_*' and self.row < you.row):
+                # You are higher -- robot goes up.
+                if self.row > you.row:
+                    self.vector = 0, -1
+                # There is a floor, load, ladder, or portal under the robot
+                # -- or you are under the robot -- the robot goes down.
+                elif below in '_*|@' or self.column == you.column:
+                    self.vector = 0, +1
+                else:
+                    # Find out if there is anything to land on.
+                    look_down = 2
+                    eye = self.screen.read(self.row + look_down, self.column)
+                    while eye and eye not in '_*|@':
+                        look_down += 1
+                        eye = self.screen.read(self.row + look_down, self.column)
+                    # If so, go through with "jumping" down.
+                    if eye and eye in '_*|@':
+                        self.vector = 0, +1
+
+################################################################################
+
+class Navigator:
+
+    '''Navigator(screen) -> Navigator
+
+    The navigator knows, for every cell of the board, where each of
+    the four moves would take an actor standing there under the rules
+    of Player.move (walking, climbing, falling, and portals). These
+    edges are found once per board; a change to the environment only
+    finds them again for the cells around it. Distances to a target
+    cell come from one breadth-first search over the edges in reverse
+    and are kept until the target or the board changes.'''
+
+    MOVES = (0, -1), (0, +1), (-1, 0), (+1, 0)
+
+    def __init__(self, screen):
+        'Initialize the Navigator object.'
+        self.screen = screen
+        self.__portals = screen.find('@')
+        self.__moves = {}       # cell -> ((vector, cell), ...)
+        self.__into = {}        # cell -> set of cells that move into it
+        self.__target = None
+        self.__distance = {}
+        for row in range(screen.height):
+            for column in range(screen.width):
+                self.__link((row, column))
+
+    def changed(self, row, column):
+        'Find the moves again around a cell whose environment changed.'
+        for other_row in range(row - 1, row + 2):
+            for other_column in range(column - 2, column + 3):
+                if (other_row, other_column) in self.__moves:
+                    self.__link((other_row, other_column))
+        self.__target = None
+
+    def distances(self, target):
+        'Return {cell: moves needed to reach target} for cells that can.'
+        if target != self.__target:
+            distance = {target: 0}
+            frontier = [target]
+            while frontier:
+                following = []
+                for cell in frontier:
+                    steps = distance[cell] + 1
+                    for source in self.__into.get(cell, ()):
+                        if source not in distance:
+                            distance[source] = steps
+                            following.append(source)
+                frontier = following
+            self.__target, self.__distance = target, distance
+        return self.__distance
+
+    def moves(self, row, column):
+        'Return ((vector, cell), ...) for the moves out of the cell.'
+        return self.__moves.get((row, column), ())
+
+    def reach(self, start):
+        'Return {cell: moves needed from start} for cells that start reaches.'
+        distance = {start: 0}
+        frontier = [start]
+        while frontier:
+            following = []
+            for cell in frontier:
+                steps = distance[cell] + 1
+                for move, other in self.__moves.get(cell, ()):
+                    if other not in distance:
+                        distance[other] = steps
+                        following.append(other)
+            frontier = following
+        return distance
+
+    def direction(self, row, column, target):
+        'Return the vector that brings the cell closest to target or None.'
+        distance = self.distances(target)
+        if (row, column) not in distance:
+            return None
+        best, vector = distance[row, column], None
+        for move, cell in self.__moves.get((row, column), ()):
+            if distance.get(cell, best) < best:
+                best, vector = distance[cell], move
+        return vector
+
+    def __link(self, cell):
+        'Private class method.'
+        for move, other in self.__moves.get(cell, ()):
+            self.__into[other].discard(cell)
+        moves = []
+        for move in self.MOVES:
+            other = self.__result(cell, move)
+            if other is not None and other != cell:
+                moves.append((move, other))
+                self.__into.setdefault(other, set()).add(cell)
+        self.__moves[cell] = tuple(moves)
+
+    def __result(self, cell, vector):
+        'Private class method.'
+        read = self.screen.cache_read
+        row, column = cell
+        context = read(row, column)
+        left = read(row, column - 1)
+        right = read(row, column + 1)
+        x, y = vector
+        x_move = False
+        if context == '_' or context == '*':
+            column += x
+            x_move = True
+        elif context == '@':
+            if left is not None and left in '_*|' and x == -1:
+                column += x
+            elif right is not None and right in '_*|' and x == 1:
+                column += x
+            elif read(row + 1, column) == '|' and y == 1:
+                row += y
+            elif read(row - 1, column) == '|' and y == -1:
+                row += y
+            else:
+                row += 1
+        elif context == '|':
+            row += y
+        elif context == ' ':
+            if read(row + 1, column) != '|' or y == 1:
+                row += 1
+            else:
+                column += x
+        if not x_move and context != ' ':
+            if left is not None and left in '_*' and x == -1:
+                column += x
+            elif right is not None and right in '_*' and x == 1:
+                column += x
+        landing = read(row, column)
+        if landing is None:
+            return None
+        if landing == '@' and len(self.__portals) == 2:
+            first, second = self.__portals
+            return second if (row, column) == first else first
+        return row, column
+
+################################################################################
+
+class Game:
+
+    '''Game(screen[, rng[, sound[, robots[, navigate]]]]) -> Game
+
+    The game plays one board on a screen: a Field, or anything with
+    the same methods and size. Unless navigate is false, robots take
+    the shortest path to you when there is one and otherwise fall
+    back to heading your way. Each step takes the command given
+    during the tick (commands given together, such as "upleft", are
+    ignored as they are from the keyboard). The names of the sounds
+    played in the last step are kept in sounds, and each is also
+    passed to sound(name, block) if that is given.'''
+
+    def __init__(self, screen, rng=_random, sound=None, robots=ROBOTS, navigate=True):
+        'Initialize the Game object.'
+        self.screen = screen
+        self.navigator = None
+        if navigate:
+            self.navigator = Navigator(screen)
+            screen.watch(self.navigator.changed)
+        self.rng = rng
+        self.sound = sound
+        self.robots = robots
+        self.sounds = []
+        self.win_condition = screen.count('*') * SCORE
+        self.you = You(self, '^')
+        screen.update()
+        self.players = [self.you]
+        self.clock = 0
+        self.playing = True
+        self.running = True
+        self.note = False
+
+    @property
+    def won(self):
+        'Whether every load has been picked up.'
+        return self.you.score == self.win_condition
+
+    def check(self):
+        'Return whether the game goes on.'
+        return self.running and self.playing
+
+    def play(self, name, block=False):
+        'Play a sound.'
+        self.sounds.append(name)
+        if self.sound is not None:
+            self.sound(name, block)
+
+    def step(self, command=''):
+        'Move everyone on the board by one tick.'
+        self.sounds = []
+        self.clock += 1
+        if self.clock > SPAWN and len(self.players) - 1 < self.robots:
+            self.players.append(Robot(self, '&', column=self.rng.randrange(self.screen.width)))
+        for player in self.players:
+            player.setDirection(command)
+            player.move()
+        self.screen.update()
+        if self.won:
+            self.running = False
+        if self.note:
+            self.play('move_high')
+        else:
+            self.play('move_low')
+        self.note = not self.note
+
+################################################################################
+
+def run(board, bot=None, ticks=10000, rng=None):
+    'Play the board until the game ends or ticks run out and return the Game.'
+    rng = _random.Random() if rng is None else rng
+    if bot is None:
+        bot = lambda game: rng.choice(COMMANDS)
+    game = Game(Field.from_board(board), rng)
+    while ticks and game.check():
+        game.step(bot(game))
+        ticks -= 1
+    return game
+
+def main(argv=None):
+    'Time random games on every board.'
+    from . import levels
+    parser = _argparse.ArgumentParser(prog='python -m source.rules', description='Play random Lode Runner games without Tk.')
+    parser.add_argument('-t', '--ticks', type=int, default=10000, help='most ticks per board')
+    parser.add_argument('-s', '--seed', type=int, default=0, help='random seed')
+    args = parser.parse_args(argv)
+    rng = _random.Random(args.seed)
+    total = 0
+    start = _time.perf_counter()
+    with levels.builtin() as pack:
+        for board in pack:
+            game = run(board, None, args.ticks, rng)
+            total += game.clock
+            print('%s: %d ticks, score %d of %d' % (board.name(), game.clock, game.you.score, game.win_condition))
+    seconds = _time.perf_counter() - start
+    print('%d ticks in %.2f s: %.0f ticks/s' % (total, seconds, total / seconds if seconds else 0))
+    return 0
+
+################################################################################
+
+if __name__ == '__main__':
+    _sys.exit(main())
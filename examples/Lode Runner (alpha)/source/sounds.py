@@ -1,6 +1,4 @@
 #! /usr/bin/env python3
-import pickle as cPickle
-
 ################################################################################
 
 class ConfigParser: # Helps parse XML documents.
@@ -33,136 +31,181 @@ class ConfigParser: # Helps parse XML documents.
 ################################################################################
 
 from .xml_stream import *
+from . import audio
+import heapq
+import os
+import threading
+import time
+import warnings
+
+BACKEND = None # audio backend shared by all sounds (made when first needed)
 
-try:
-    import winsound
-    import _thread as thread
-    import queue as Queue
-    import time
-    import os
-except ImportError:
-    class Server: # Dummy Class with Parser
-        def __init__(self, path, history):
-            # NEW - get needed configuration data
-            stream = Stream(path)
-            stream.minimize()
-            parser = ConfigParser()
-            stream.parse(parser)
-            # make TITLE_COLOR and BACKGROUND_COLOR public
-            self.TITLE_COLOR = parser.TITLE_COLOR
-            self.BACKGROUND_COLOR = parser.BACKGROUND_COLOR
-        def play(self, name, block=False):
-            pass
-else:
+def get_backend():
+    global BACKEND
+    if BACKEND is None:
+        BACKEND = audio.default()
+    return BACKEND
 
 ################################################################################
 
-    class WAV: # Plays WAV data.
+class WAV: # Plays WAV data.
 
-        def __init__(self, name):
-            self.__name = name
+    def __init__(self, name):
+        # decode the file once and keep the sample in memory
+        # (winsound can still play what cannot be decoded by filename)
+        try:
+            self.sample = audio.load_wav(name)
+        except ValueError as error:
+            warnings.warn(str(error))
+            self.sample = audio.Sample(None, name)
 
-        def play(self):
-            winsound.PlaySound(self.__name, winsound.SND_FILENAME)
-        
+    def play(self):
+        get_backend().play(self.sample)
 
 ################################################################################
 
-    class PIF: # Plays PIF (Python Interface Format [sound]) data.
+class PIF: # Plays PIF (Python Interface Format [sound]) data.
+
+    def __init__(self, data):
+        # synthesize the beeps once as a sample
+        data = data.split(' ')
+        data = [data[index:index+3] for index in range(0, len(data), 3)]
+        self.sample = audio.synthesize((float(secs), int(frequency), int(duration)) for secs, frequency, duration in data)
 
-        def __init__(self, data):
-            data = data.split(' ')
-            data = [data[index:index+3] for index in range(0, len(data), 3)]
-            self.__data = [(float(secs), int(frequency), int(duration)) for secs, frequency, duration in data]
+    def play(self):
+        get_backend().play(self.sample)
+
+################################################################################
 
-        def play(self):
-            for secs, frequency, duration in self.__data:
-                time.sleep(secs)
-                winsound.Beep(frequency, duration)
+WINDOW = 0.125 # seconds in which a sound is not repeated and stays fresh
+PRIORITY = {'win': 3, 'lose': 3, 'kill': 2, 'score': 1} # others are 0
+
+class Mixer: # Plays sounds on a thread of its own.
+
+    def __init__(self, sounds, backend, window=WINDOW, priority=PRIORITY):
+        # sounds maps names to the samples that the backend plays
+        # requests wait in a heap (highest priority, then newest, first)
+        # counters are kept for requests that were played or dropped
+        self.sounds = sounds
+        self.backend = backend
+        self.window = window
+        self.priority = priority
+        self.requested = self.played = 0
+        self.unknown = self.coalesced = self.dropped = self.failed = 0
+        self.latency = self.worst = 0.0
+        self.__pending = []
+        self.__number = 0
+        self.__queued = {}
+        self.__busy = False
+        self.__condition = threading.Condition()
+        thread = threading.Thread(target=self.__player, name='Mixer', daemon=True)
+        thread.start()
+
+    def play(self, name, block=False):
+        # drop sounds that the theme does not have
+        # drop repeats of a sound queued within the window
+        # queue the request and wake up the player
+        # if block, wait until the sound has played (or was dropped)
+        now = time.perf_counter()
+        with self.__condition:
+            self.requested += 1
+            if name not in self.sounds:
+                self.unknown += 1
+                return
+            if not block and name in self.__queued and now - self.__queued[name] < self.window:
+                self.coalesced += 1
+                return
+            self.__queued[name] = now
+            self.__number += 1
+            done = threading.Event() if block else None
+            heapq.heappush(self.__pending, (-self.priority.get(name, 0), -self.__number, now, name, done))
+            self.__condition.notify_all()
+        if done is not None:
+            done.wait()
+
+    def wait(self, timeout=None):
+        # wait until nothing is queued or playing
+        with self.__condition:
+            return self.__condition.wait_for(lambda: not self.__pending and not self.__busy, timeout)
+
+    def stats(self):
+        # return the counters with the mean and worst latency in seconds
+        with self.__condition:
+            return {'requested': self.requested,
+                    'played': self.played,
+                    'unknown': self.unknown,
+                    'coalesced': self.coalesced,
+                    'dropped': self.dropped,
+                    'failed': self.failed,
+                    'latency': self.latency / self.played if self.played else 0.0,
+                    'worst': self.worst}
+
+    def __player(self):
+        # play forever
+        # wait for a request and take the best one
+        # drop it if it went stale waiting for other sounds to finish
+        # (blocking requests are never stale)
+        # play the sound and release anyone waiting on it
+        # (a backend that fails is counted and the player goes on)
+        while True:
+            with self.__condition:
+                self.__busy = False
+                self.__condition.notify_all()
+                while not self.__pending:
+                    self.__condition.wait()
+                priority, number, queued, name, done = heapq.heappop(self.__pending)
+                delay = time.perf_counter() - queued
+                if done is None and delay > self.window:
+                    self.dropped += 1
+                    continue
+                self.__busy = True
+                self.played += 1
+                self.latency += delay
+                self.worst = max(self.worst, delay)
+            try:
+                self.backend.play(self.sounds[name])
+            except Exception:
+                with self.__condition:
+                    self.failed += 1
+            finally:
+                if done is not None:
+                    done.set()
 
 ################################################################################
-            
-    class Server:
-        
-        def __init__(self, path, history):
-            # keep sound history
-            # create a stream from the file on path
-            # minimize the stream (for parsing purposes)
-            # create a SoundParser helper object
-            # parse the data into the SoundParser
-            # create a dictionary (map) of sound to register
-            # extract the sounds from the parser and build appropriate objects
-            # create a playlist queue for incoming play requests
-            # start the sound player
-            self.__history = history
-            stream = Stream(path)
-            stream.minimize()
-            parser = ConfigParser()
-            stream.parse(parser)
-            # make TITLE_COLOR and BACKGROUND_COLOR public
-            self.TITLE_COLOR = parser.TITLE_COLOR
-            self.BACKGROUND_COLOR = parser.BACKGROUND_COLOR
-            self.__sounds = {}
-            for key in parser.sounds:
-                data_type, data = parser.sounds[key]
-                if data_type == 'wav':
-                    self.__sounds[key] = WAV(os.path.join(os.path.dirname(path), data))
-                else:
-                    assert data_type == 'pif'
-                    self.__sounds[key] = PIF(data)
-            self.__playlist = Queue.Queue()
-            thread.start_new_thread(self.__player, ())
-        
-        def play(self, name, block=False):
-            # make a sound play request
-            # record sound request
-            # if block, hold on a locked mutex
-            cPickle.dump((name, block), self.__history, -1)
-            if block:
-                lock = thread.allocate_lock()
-                lock.acquire()
-                self.__playlist.put([name, lock])
-                lock.acquire()
+
+class Server:
+
+    def __init__(self, path, history, backend=None):
+        # keep sound history
+        # create a stream from the file on path
+        # minimize the stream (for parsing purposes)
+        # create a SoundParser helper object
+        # parse the data into the SoundParser
+        # extract the sounds from the parser and decode their samples
+        # start a mixer on the backend (the shared one if none is given)
+        self.__history = history
+        stream = Stream(path)
+        stream.minimize()
+        parser = ConfigParser()
+        stream.parse(parser)
+        # make TITLE_COLOR and BACKGROUND_COLOR public
+        self.TITLE_COLOR = parser.TITLE_COLOR
+        self.BACKGROUND_COLOR = parser.BACKGROUND_COLOR
+        sounds = {}
+        for key in parser.sounds:
+            data_type, data = parser.sounds[key]
+            if data_type == 'wav':
+                sounds[key] = WAV(os.path.join(os.path.dirname(path), data)).sample
             else:
-                self.__playlist.put([name])
-
-        def __player(self):
-            # play forever
-            # if the playlist is empty, wait for a new request
-            #     play the sound if possible
-            #     release lock if present
-            # else
-            #     create a stack (list)
-            #     empty the playlist into the stack
-            #     (the most recent requests are at the top)
-            #     go through the stack
-            #         if the sound is registered, play it and break
-            #         always release locks if present
-            #     if there is anything left in the stack, release all locks
-            while True:
-                if self.__playlist.empty():
-                    item = self.__playlist.get()
-                    if item[0] in self.__sounds:
-                        self.__sounds[item[0]].play()
-                    if len(item) == 2:
-                        item[1].release()
-                else:
-                    stack = []
-                    while not self.__playlist.empty():
-                        stack.append(self.__playlist.get())
-                    while stack:
-                        item = stack.pop()
-                        if item[0] in self.__sounds:
-                            self.__sounds[item[0]].play()
-                            if len(item) == 2:
-                                item[1].release()
-                            break
-                        elif len(item) == 2:
-                            item[1].release()
-                    while stack:
-                        item = stack.pop()
-                        if len(item) == 2:
-                            item[1].release()
+                assert data_type == 'pif'
+                sounds[key] = PIF(data).sample
+        self.mixer = Mixer(sounds, get_backend() if backend is None else backend)
+
+    def play(self, name, block=False):
+        # record sound request
+        # hand it to the mixer (which waits if block)
+        self.__history.sound(name, block)
+        self.mixer.play(name, block)
 
 ################################################################################
 ################################################################################
@@ -1,6 +1,6 @@
 #! /usr/bin/env python3
 from tkinter import *
-import pickle as cPickle
+from . import rules
 import os
 
 ################################################################################
@@ -16,11 +16,11 @@ class Screen3:
                  '@': 'portal'}
 
     def __init__(self, board, callback, check, keys, root):
-        self.__cache = [list(row) for row in board.board().splitlines()[1:]]
-        self.__cache_rows = len(self.__cache) # NUMBER OF ROWS
-        self.__cache_columns = len(self.__cache[0]) # NUMBER OF COLUMNS
-        self.__hand = [[None] * len(self.__cache[0]) for x in range(len(self.__cache))]
-        self.__board()
+        # THE BOARD (CELLS TO CHECK ON THE NEXT FRAME ARE IN field.dirty)
+        self.field = rules.Field.from_board(board)
+        self.height = self.field.height # NUMBER OF ROWS
+        self.width = self.field.width # NUMBER OF COLUMNS
+        self.__hand = [[None] * self.width for x in range(self.height)]
         self.__callback = callback
         self.__check = check
         # ROOT
@@ -29,8 +29,8 @@ class Screen3:
         self.__images = self.IMAGES
         # MORE ROOT
         self.__root.overrideredirect(True)
-        w = len(self.__cache[0]) * self.IMAGE_WIDTH + 3 # PIXELS
-        h = len(self.__cache) * self.IMAGE_HEIGHT + 3 # PIXELS
+        w = self.width * self.IMAGE_WIDTH + 3 # PIXELS
+        h = self.height * self.IMAGE_HEIGHT + 3 # PIXELS
         x = self.__root.winfo_screenwidth()
         y = self.__root.winfo_screenheight()
         self.__root.geometry('%dx%d+%d+%d' % (w, h, (x - w) / 2, (y - h) / 2))
@@ -80,7 +80,7 @@ class Screen3:
             raise SystemExit(False)
 
     def __start(self):
-        for rnum, row in enumerate(self.__temp):
+        for rnum, row in enumerate(self.field.temp.lines()):
             for cnum, key in enumerate(row):
                 if key in self.__images:
                     x = cnum * self.IMAGE_WIDTH + self.IMAGE_WIDTH // 2 + 1
@@ -90,47 +90,29 @@ class Screen3:
                     self.__hand[rnum][cnum] = [(hand, key), (None, None)] # [(environment_handle, environment_key), (actor_handle, actor_key)]
                 else:
                     self.__hand[rnum][cnum] = [(None, ' '), (None, None)] # [(environment_handle, environment_key), (actor_handle, actor_key)]
+        # [(environment_key, actor_key), ...] AS SAVED IN THE HISTORY
+        self.__frame = [[(env[1], act[1]) for env, act in row] for row in self.__hand]
 
     def cache_write(self, row, column, character):
-        try:
-            assert 0 <= row < self.__cache_rows and 0 <= column < self.__cache_columns
-            self.__cache[row][column] = character[0]
-            self.write(row, column, character)
-        except:
-            pass
+        self.field.cache_write(row, column, character)
 
     def cache_read(self, row, column):
-        try:
-            assert 0 <= row < self.__cache_rows and 0 <= column < self.__cache_columns
-            return self.__cache[row][column]
-        except:
-            pass
+        return self.field.cache_read(row, column)
+
+    def watch(self, watcher):
+        self.field.watch(watcher)
 
     def find(self, char):
-        answers = []
-        for num, row in enumerate(self.__cache):
-            add = 0
-            while char in row:
-                column = row.index(char)
-                answers.append((num, column + add))
-                size = column + 1
-                row = row[size:]
-                add += size
-        return answers
+        return self.field.find(char)
+
+    def count(self, char):
+        return self.field.count(char)
 
     def write(self, row, column, character):
-        try:
-            assert 0 <= row < self.__cache_rows and 0 <= column < self.__cache_columns
-            self.__temp[row][column] = character[0]
-        except:
-            pass
+        self.field.write(row, column, character)
 
     def read(self, row, column):
-        try:
-            assert 0 <= row < self.__cache_rows and 0 <= column < self.__cache_columns
-            return self.__temp[row][column]
-        except:
-            pass
+        return self.field.read(row, column)
 
     def update(self):
         # self.__clear()
@@ -138,48 +120,46 @@ class Screen3:
             self.__print()
         except:
             pass
-        self.__board()
+        self.field.update()
 
     def __print(self):
-        for row in range(len(self.__cache)):
-            for column in range(len(self.__cache[0])):
-                env, obj = self.__hand[row][column]  # [(environment_handle, environment_key), (actor_handle, actor_key)]
-                # DRAW ACTORS
-                obj_hand, obj_key = obj
-                temp_key = self.__temp[row][column]
-                if obj_key != temp_key:
-                    if obj_hand is not None:
-                        self.__canvas.delete(obj_hand)
-                    if temp_key in '^&':
-                        x = column * self.IMAGE_WIDTH + self.IMAGE_WIDTH // 2 + 1
-                        y = row * self.IMAGE_HEIGHT + self.IMAGE_HEIGHT // 2 + 1
-                        coords = x, y
-                        hand = self.__canvas.create_image(coords, image=self.__images[temp_key])
-                        self.__hand[row][column][1] = (hand, temp_key)
-                    else:
-                        self.__hand[row][column][1] = (None, None)
-                # DRAW ENVIRONMENT
-                env_hand, env_key = env
-                cache_key = self.__cache[row][column]
-                if env_key != cache_key:
-                    if env_hand is not None:
-                        self.__canvas.delete(env_hand)
-                    if cache_key == ' ':
-                        self.__hand[row][column][0] = (None, cache_key)
-                    else:
-                        x = column * self.IMAGE_WIDTH + self.IMAGE_WIDTH // 2 + 1
-                        y = row * self.IMAGE_HEIGHT + self.IMAGE_HEIGHT // 2 + 1
-                        coords = x, y
-                        hand = self.__canvas.create_image(coords, image=self.__images[cache_key])
-                        self.__hand[row][column][0] = (hand, cache_key)
-                        # MAKE SURE THE ENVIRONMENT IS NOT COVERING THE ACTOR
-                        actor_handle = self.__hand[row][column][1][0]
-                        if actor_handle is not None:
-                            self.__canvas.tag_raise(actor_handle, hand)
+        for row, column in self.field.dirty:
+            env, obj = self.__hand[row][column]  # [(environment_handle, environment_key), (actor_handle, actor_key)]
+            # DRAW ACTORS
+            obj_hand, obj_key = obj
+            temp_key = self.field.temp[row, column]
+            if obj_key != temp_key:
+                if obj_hand is not None:
+                    self.__canvas.delete(obj_hand)
+                if temp_key in '^&':
+                    x = column * self.IMAGE_WIDTH + self.IMAGE_WIDTH // 2 + 1
+                    y = row * self.IMAGE_HEIGHT + self.IMAGE_HEIGHT // 2 + 1
+                    coords = x, y
+                    hand = self.__canvas.create_image(coords, image=self.__images[temp_key])
+                    self.__hand[row][column][1] = (hand, temp_key)
+                else:
+                    self.__hand[row][column][1] = (None, None)
+            # DRAW ENVIRONMENT
+            env_hand, env_key = env
+            cache_key = self.field.cache[row, column]
+            if env_key != cache_key:
+                if env_hand is not None:
+                    self.__canvas.delete(env_hand)
+                if cache_key == ' ':
+                    self.__hand[row][column][0] = (None, cache_key)
+                else:
+                    x = column * self.IMAGE_WIDTH + self.IMAGE_WIDTH // 2 + 1
+                    y = row * self.IMAGE_HEIGHT + self.IMAGE_HEIGHT // 2 + 1
+                    coords = x, y
+                    hand = self.__canvas.create_image(coords, image=self.__images[cache_key])
+                    self.__hand[row][column][0] = (hand, cache_key)
+                    # MAKE SURE THE ENVIRONMENT IS NOT COVERING THE ACTOR
+                    actor_handle = self.__hand[row][column][1][0]
+                    if actor_handle is not None:
+                        self.__canvas.tag_raise(actor_handle, hand)
+            env, obj = self.__hand[row][column]
+            self.__frame[row][column] = env[1], obj[1]
         # UPDATE THE CANVAS
         self.__canvas.update()
         # save the screen's state
-        cPickle.dump([[(env[1], act[1]) for env, act in row] for row in self.__hand], self.HISTORY, -1)
-        
-    def __board(self):
-        self.__temp = [list(row) for row in self.__cache]
+        self.HISTORY.frame(self.__frame, self.field.dirty)
@@ -0,0 +1,219 @@
+#! /usr/bin/env python3
+'''Module for validating game boards.
+
+This module checks that boards can be won. It builds the movement
+graph that rules.Navigator uses, finds every cell you can reach from
+where you start, and reports any load or portal that cannot be
+reached. Cutting is allowed for: any cell beside a cell you can reach
+(other than a portal) may be cut, and you may then fall through it,
+which can open up more of the board. This is an approximation:
+
+    - holes never close and may be cut before they are needed;
+    - a load is assumed to be picked up before its cell is cut;
+    - being able to step into a cell before it was cut is kept.
+
+The model errs on the side of passing boards, so one reported as
+unsolvable almost certainly cannot be won, while one that passes may
+still need a trick that the game does not allow. For boards that can
+be won it works out the length of the shortest route that picks up
+every load: exactly (Held-Karp) when there are few loads and with a
+nearest-load tour otherwise. Routes only go one way through a fall,
+so when no route is found through every load it is a warning, not a
+failure. Boards are checked on a pool of worker processes:
+
+    python -m source.validate [-j JOBS] [FILE ...]
+
+With no files the boards in the boards module are checked. Files
+may be level packs or board files (see the levels module).'''
+
+__version__ = '1.0'
+
+import argparse as _argparse
+import concurrent.futures as _futures
+import sys as _sys
+import time as _time
+
+from . import boards as _boards
+from . import levels as _levels
+from . import rules as _rules
+
+################################################################################
+
+START = 0, 10           # where You starts (row, column)
+EXACT = 10              # most loads for an exact route
+
+################################################################################
+
+class Result:
+
+    'Result(name) -> Result'
+
+    def __init__(self, name):
+        'Initialize the Result object.'
+        self.name = name
+        self.error = None
+        self.loads = 0
+        self.reachable = 0
+        self.lost_loads = []
+        self.lost_portals = []
+        self.route = None
+        self.exact = False
+        self.seconds = 0.0
+
+    @property
+    def ok(self):
+        'Whether the board can be won.'
+        return self.error is None and not self.lost_loads and not self.lost_portals
+
+    def __str__(self):
+        'Return the result as text.'
+        if self.error is not None:
+            return '%s: INVALID (%s)' % (self.name, self.error)
+        if not self.ok:
+            problems = []
+            if self.lost_loads:
+                problems.append('%d of %d loads unreachable %s' % (len(self.lost_loads), self.loads, self.lost_loads[:5]))
+            if self.lost_portals:
+                problems.append('portals unreachable %s' % self.lost_portals)
+            return '%s: UNSOLVABLE (%s)' % (self.name, '; '.join(problems))
+        if self.route is None:
+            return '%s: ok, %d loads, WARNING: no %s route found through them all, %d cells reachable (%.2f s)' % (
+                self.name, self.loads, 'one-way' if self.exact else 'nearest-load', self.reachable, self.seconds)
+        return '%s: ok, %d loads, %s route of %d moves, %d cells reachable (%.2f s)' % (
+            self.name, self.loads, 'shortest' if self.exact else 'nearest-load', self.route, self.reachable, self.seconds)
+
+################################################################################
+
+def check(name, text):
+    'Return the Result of checking the board (text as in boards.Board).'
+    result = Result(name)
+    start = _time.perf_counter()
+    try:
+        board = _boards.Board(name, text)
+    except AssertionError:
+        result.error = 'bad name, characters, row widths, or portal count'
+        return result
+    field = _rules.Field.from_board(board)
+    graph = _graph(field, _rules.Navigator(field))
+    reach = _reach(graph, START)
+    while _cut(field, graph, reach):
+        reach = _reach(graph, START)
+    loads = field.find('*')
+    result.loads = len(loads)
+    result.reachable = len(reach)
+    result.lost_loads = [cell for cell in loads if cell not in reach]
+    result.lost_portals = [cell for cell in field.find('@') if cell not in reach]
+    if result.ok:
+        result.exact = len(loads) <= EXACT
+        result.route = (_exact_route if result.exact else _greedy_route)(graph, reach, loads)
+    result.seconds = _time.perf_counter() - start
+    return result
+
+def run(boards, jobs=None):
+    'Yield the Result of each (name, text) board, checked on a process pool.'
+    with _futures.ProcessPoolExecutor(jobs) as pool:
+        work = [pool.submit(check, name, text) for name, text in boards]
+        for future in work:
+            yield future.result()
+
+################################################################################
+
+def main(argv=None):
+    'Check boards from the command line.'
+    parser = _argparse.ArgumentParser(prog='python -m source.validate', description='Check that Lode Runner boards can be won.')
+    parser.add_argument('files', nargs='*', metavar='FILE', help='board files or level packs (default: the built-in boards)')
+    parser.add_argument('-j', '--jobs', type=int, help='worker processes (default: one per core)')
+    args = parser.parse_args(argv)
+    if args.files:
+        boards = [board for filename in args.files for board in _levels.read(filename)]
+    else:
+        boards = list(_boards.texts)
+    start = _time.perf_counter()
+    failed = 0
+    for result in run(boards, args.jobs):
+        print(result)
+        failed += not result.ok
+    print('%d boards checked in %.2f s, %d failed' % (len(boards), _time.perf_counter() - start, failed))
+    return 1 if failed else 0
+
+################################################################################
+
+def _graph(field, navigator):
+    'Return {cell: [cell, ...]} of the moves on the uncut board.'
+    graph = {}
+    for row in range(field.height):
+        for column in range(field.width):
+            graph[row, column] = [other for move, other in navigator.moves(row, column)]
+    return graph
+
+def _cut(field, graph, reach):
+    'Add falls through the cells that can be cut from reach; return if any were.'
+    added = False
+    for (row, column), cells in graph.items():
+        # A floor, ladder, or (picked up) load can be cut from either
+        # side, and the hole left behind is air: you fall through it,
+        # or step off sideways if there is a ladder below.
+        if field.cache_read(row, column) in ('_', '|', '*'):
+            if (row, column - 1) in reach or (row, column + 1) in reach:
+                moves = [(row + 1, column)]
+                if field.cache_read(row + 1, column) == '|':
+                    moves += (row, column - 1), (row, column + 1)
+                for other in moves:
+                    if other in graph and other not in cells:
+                        cells.append(other)
+                        added = True
+    return added
+
+def _reach(graph, start):
+    'Return {cell: moves needed from start} for cells that start reaches.'
+    distance = {start: 0}
+    frontier = [start]
+    while frontier:
+        following = []
+        for cell in frontier:
+            steps = distance[cell] + 1
+            for other in graph.get(cell, ()):
+                if other not in distance:
+                    distance[other] = steps
+                    following.append(other)
+        frontier = following
+    return distance
+
+def _exact_route(graph, reach, loads):
+    'Return the length of the shortest route through every load (Held-Karp).'
+    if not loads:
+        return 0
+    distance = [[_reach(graph, load).get(other, float('inf')) for other in loads] for load in loads]
+    count = len(loads)
+    best = {(1 << index, index): reach[load] for index, load in enumerate(loads)}
+    for size in range(2, count + 1):
+        following = {}
+        for (visited, last), length in best.items():
+            for index in range(count):
+                if not visited & 1 << index:
+                    key = visited | 1 << index, index
+                    total = length + distance[last][index]
+                    if total < following.get(key, float('inf')):
+                        following[key] = total
+        best = following
+    length = min(best.values())
+    return None if length == float('inf') else length
+
+def _greedy_route(graph, reach, loads):
+    'Return the length of a route that always goes to the nearest load left.'
+    left = set(loads)
+    here = reach
+    length = 0
+    while left:
+        load = min(left, key=lambda cell: (here.get(cell, float('inf')), cell))
+        if load not in here:
+            return None         # fell where the loads left cannot be reached
+        length += here[load]
+        left.discard(load)
+        here = _reach(graph, load)
+    return length
+
+################################################################################
+
+if __name__ == '__main__':
+    _sys.exit(main())
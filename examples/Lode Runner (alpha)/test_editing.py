@@ -0,0 +1,75 @@
+#! /usr/bin/env python3
+'Tests for the source.editing module.'
+
+################################################################################
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from source import editing
+from source import recording
+from test_recording import game, record, play
+
+################################################################################
+
+class EditingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.scenes = [game(120, 0), game(80, 1, 5, 7), game(60, 2)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, items):
+        'Record items to a video in the directory and return its name.'
+        filename = os.path.join(self.directory, name)
+        with open(filename, 'wb') as file:
+            record(items, recording.recorder(file, editing.extension(filename)))
+        return filename
+
+    def read(self, filename):
+        'Return the frames and sounds in the video.'
+        with open(filename, 'rb') as file:
+            return play(recording.events(file))
+
+    def test_split(self):
+        for kind in 'gva', 'gvb', 'gvc':
+            filename = self.write('game.' + kind, sum(self.scenes, []))
+            scenes = editing.split(filename)
+            self.assertEqual([os.path.basename(scene) for scene in scenes],
+                             ['game-S%d.%s' % (number, kind) for number in (1, 2, 3)])
+            self.assertEqual(list(map(self.read, scenes)), self.scenes)
+
+    def test_split_into_directory(self):
+        filename = self.write('game.gvc', sum(self.scenes, []))
+        directory = os.path.join(self.directory, 'scenes')
+        os.mkdir(directory)
+        scenes = editing.split(filename, directory)
+        self.assertEqual([os.path.dirname(scene) for scene in scenes], [directory] * 3)
+
+    def test_merge(self):
+        for kinds in ('gvb', 'gvb', 'gva'), ('gvc', 'gvc', 'gvc'), ('gva', 'gvc', 'gvb'):
+            filenames = [self.write('scene%d.%s' % (number, kind), scene)
+                         for number, (kind, scene) in enumerate(zip(kinds, self.scenes))]
+            target = os.path.join(self.directory, 'merged.' + editing.merged_extension(filenames))
+            editing.merge(filenames, target)
+            self.assertEqual(self.read(target), sum(self.scenes, []), kinds)
+
+    def test_split_and_merge_round_trip(self):
+        filename = self.write('game.gvc', sum(self.scenes, []))
+        target = os.path.join(self.directory, 'merged.gvc')
+        editing.merge(editing.split(filename), target)
+        self.assertEqual(self.read(target), self.read(filename))
+
+    def test_merged_extension(self):
+        self.assertEqual(editing.merged_extension(['a.gva', 'b.GVA']), 'gva')
+        self.assertEqual(editing.merged_extension(['a.gva', 'b.gvb']), 'gvb')
+        self.assertEqual(editing.merged_extension(['a.gvb', 'b.gvc']), 'gvc')
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+#! /usr/bin/env python3
+'Tests for the source.levels module.'
+
+################################################################################
+
+import io
+import unittest
+
+from source import boards
+from source import levels
+
+################################################################################
+
+class PackTest(unittest.TestCase):
+
+    def test_builtin_loads_on_demand(self):
+        with levels.builtin(cache=2) as pack:
+            self.assertEqual(len(pack), len(boards.texts))
+            self.assertEqual(pack.names(), [name for name, text in boards.texts])
+            self.assertEqual(pack.loads, 0)
+            for number in 0, 1, 0, 2, 1:
+                board = pack[number]
+                self.assertIsInstance(board, boards.Board)
+                self.assertEqual((board.name(), board.board()), boards.texts[number])
+            self.assertEqual(pack.loads, 4)
+        self.assertTrue(pack.file.closed)
+
+    def test_round_trip(self):
+        file = io.BytesIO()
+        levels.write(file, boards.texts)
+        file.seek(0)
+        self.assertTrue(levels.is_pack(file))
+        pack = levels.Pack(file)
+        self.assertEqual([pack.text(number) for number in range(len(pack))], list(boards.texts))
+        self.assertEqual(pack[-1].name(), boards.texts[-1][0])
+
+    def test_bad_board_fails_when_played(self):
+        file = io.BytesIO()
+        levels.write(file, [('Good', '\n _ \n___'), ('Bad', '\n x \n___')])
+        pack = levels.Pack(file)
+        self.assertEqual(pack[0].name(), 'Good')
+        self.assertRaises(AssertionError, pack.__getitem__, 1)
+
+    def test_old_boards_tuple(self):
+        self.assertEqual([(board.name(), board.board()) for board in boards.boards], list(boards.texts))
+        self.assertIs(boards.boards, boards.boards)
+
+    def test_not_a_pack(self):
+        self.assertRaises(ValueError, levels.Pack, io.BytesIO(b'LRGV' + bytes(8)))
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main()
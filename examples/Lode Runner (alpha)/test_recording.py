@@ -0,0 +1,193 @@
+#! /usr/bin/env python3
+'Tests for the source.recording module.'
+
+################################################################################
+
+import io
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from source import recording
+
+################################################################################
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Example 1.gvb')
+SOUNDS = 'kill', 'lose', 'move_high', 'move_low', 'score', 'win', 'zip'
+
+def game(frames, seed, height=8, width=12):
+    'Return random frames and sounds in the order a game would record them.'
+    rng = random.Random(seed)
+    grid = [[(rng.choice(' _|*@'), None) for column in range(width)] for row in range(height)]
+    items = []
+    for frame in range(frames):
+        for change in range(rng.randrange(4)):
+            row, column = rng.randrange(height), rng.randrange(width)
+            grid[row][column] = grid[row][column][0], rng.choice((None, '^', '&'))
+        items.append([list(row) for row in grid])
+        if rng.random() < 0.2:
+            items.append((rng.choice(SOUNDS), rng.random() < 0.5))
+    return items
+
+def record(items, sink):
+    'Write the frames and sounds in items to sink and close it.'
+    for item in items:
+        if isinstance(item, tuple):
+            sink.sound(*item)
+        else:
+            sink.frame(item)
+    sink.close()
+
+def after(items, frame):
+    'Return the items from the frame with the given number onward.'
+    starts = [index for index, item in enumerate(items) if not isinstance(item, tuple)]
+    return items[starts[frame]:] if frame < len(starts) else []
+
+def play(events):
+    'Return the frames (copied) and sounds that events yields.'
+    return [item if isinstance(item, tuple) else [list(row) for row in item] for item in events]
+
+################################################################################
+
+class StreamTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        items = game(1000, 0)
+        file = io.BytesIO()
+        record(items, recording.Recorder(file, interval=50))
+        reader = recording.Reader(file)
+        self.assertEqual(reader.frames, 1000)
+        self.assertEqual(len(reader.index), 20)
+        self.assertEqual(play(reader), items)
+
+    def test_given_cells(self):
+        items = game(300, 1)
+        file = io.BytesIO()
+        sink = recording.Recorder(file, interval=40)
+        previous = None
+        for item in items:
+            if isinstance(item, tuple):
+                sink.sound(*item)
+                continue
+            cells = None if previous is None else \
+                    [(row, column) for row in range(len(item)) for column in range(len(item[0]))
+                     if item[row][column] != previous[row][column]]
+            sink.frame(item, cells)
+            previous = item
+        sink.close()
+        self.assertEqual(play(recording.Reader(file)), items)
+
+    def test_size_change_starts_keyframe(self):
+        items = game(30, 2) + game(30, 3, 5, 7)
+        file = io.BytesIO()
+        record(items, recording.Recorder(file))
+        reader = recording.Reader(file)
+        self.assertEqual([first for first, offset in reader.index], [0, 30])
+        self.assertEqual(play(reader), items)
+
+    def test_cut_short(self):
+        items = game(500, 4)
+        file = io.BytesIO()
+        sink = recording.Recorder(file, interval=100)
+        for item in items:
+            if isinstance(item, tuple):
+                sink.sound(*item)
+            else:
+                sink.frame(item)
+        # The game crashed before close; only finished segments are kept.
+        reader = recording.Reader(io.BytesIO(file.getvalue()))
+        self.assertEqual(reader.frames, 400)
+        frames = [item for item in items if not isinstance(item, tuple)]
+        self.assertEqual([item for item in play(reader) if not isinstance(item, tuple)], frames[:400])
+
+    def test_sounds_before_first_frame(self):
+        items = [('win', True), ('zip', False)] + game(100, 10)
+        file = io.BytesIO()
+        record(items, recording.Recorder(file, interval=40))
+        reader = recording.Reader(file)
+        self.assertEqual(reader.frames, 100)
+        self.assertEqual(play(reader), items)
+        self.assertEqual(play(reader.events(1)), after(items, 1))
+        # a video with no frames has nowhere to keep its sounds
+        file = io.BytesIO()
+        record([('win', True)], recording.Recorder(file))
+        self.assertEqual(play(recording.Reader(file)), [])
+
+    def test_not_a_stream(self):
+        self.assertRaises(ValueError, recording.Reader, io.BytesIO(b'nothing to see here'))
+
+################################################################################
+
+class LegacyTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        items = game(500, 5)
+        file = io.BytesIO()
+        record(items, recording.LegacyRecorder(file))
+        file.seek(0)
+        self.assertFalse(recording.is_stream(file))
+        self.assertEqual(play(recording.events(file)), items)
+
+    def test_transcode_example(self):
+        with open(EXAMPLE, 'rb') as source:
+            expected = play(recording.legacy_events(source))
+            source.seek(0)
+            target = io.BytesIO()
+            sink = recording.transcode(source, target)
+        self.assertEqual(sink.frames, sum(not isinstance(item, tuple) for item in expected))
+        target.seek(0)
+        self.assertTrue(recording.is_stream(target))
+        self.assertEqual(play(recording.events(target)), expected)
+
+class SeekTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_events_from_any_frame(self):
+        items = game(400, 6)
+        file = io.BytesIO()
+        record(items, recording.Recorder(file, interval=32))
+        reader = recording.Reader(file)
+        for frame in 0, 1, 31, 32, 33, 100, 250, 399, 400:
+            self.assertEqual(play(reader.events(frame)), after(items, frame), frame)
+
+    def test_legacy_sidecar(self):
+        items = game(300, 7)
+        filename = os.path.join(self.directory, 'game.gvb')
+        with open(filename, 'wb') as file:
+            record(items, recording.LegacyRecorder(file))
+        self.assertIsNone(recording.load_index(filename))
+        reader = recording.load_index(filename, True)
+        self.addCleanup(reader.file.close)
+        self.assertTrue(os.path.exists(filename + recording.SIDECAR))
+        self.assertEqual(reader.frames, 300)
+        self.assertEqual(play(reader.events(150)), after(items, 150))
+        # A video that is newer than its sidecar gets a new index.
+        items = game(100, 8)
+        with open(filename, 'wb') as file:
+            record(items, recording.LegacyRecorder(file))
+        os.utime(filename + recording.SIDECAR, (0, 0))
+        self.assertIsNone(recording.load_index(filename))
+        reader = recording.load_index(filename, True)
+        self.addCleanup(reader.file.close)
+        self.assertEqual(play(reader), items)
+
+    def test_stream_needs_no_sidecar(self):
+        filename = os.path.join(self.directory, 'game.gvc')
+        with open(filename, 'wb') as file:
+            record(game(50, 9), recording.Recorder(file))
+        reader = recording.load_index(filename)
+        self.addCleanup(reader.file.close)
+        self.assertEqual(reader.frames, 50)
+        self.assertFalse(os.path.exists(filename + recording.SIDECAR))
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main()
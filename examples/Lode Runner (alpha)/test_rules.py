@@ -0,0 +1,113 @@
+#! /usr/bin/env python3
+'Tests for the source.rules module.'
+
+################################################################################
+
+import random
+import unittest
+
+from source import boards
+from source import rules
+
+################################################################################
+
+def trace(board, seed, ticks):
+    'Return what a seeded random game shows and plays on each tick.'
+    rng = random.Random(seed)
+    game = rules.Game(rules.Field.from_board(board), rng)
+    seen = []
+    while len(seen) < ticks and game.check():
+        game.step(rng.choice(rules.COMMANDS))
+        seen.append(([(player.face, player.row, player.column) for player in game.players],
+                           game.sounds, game.you.score))
+    return seen
+
+################################################################################
+
+class GameTest(unittest.TestCase):
+
+    def test_walk_to_load(self):
+        sounds = []
+        game = rules.Game(rules.Field(['           ',
+                                       '     *_____',
+                                       '___________']),
+                          random.Random(0), lambda name, block: sounds.append(name), 0)
+        self.assertEqual(game.win_condition, rules.SCORE)
+        cells = []
+        while game.check():
+            game.step('left')
+            cells.append((game.you.row, game.you.column))
+        # you fall onto the floor, walk left, and pick up the load
+        self.assertEqual(cells, [(1, 10), (1, 9), (1, 8), (1, 7), (1, 6), (1, 5), (1, 4)])
+        self.assertEqual(game.sounds, ['score', 'move_low'])
+        self.assertEqual(sounds, ['move_low', 'move_high'] * 3 + ['score', 'move_low'])
+        self.assertTrue(game.won)
+        self.assertEqual(game.screen.count('*'), 0)
+
+    def test_seeded_games_repeat(self):
+        board = boards.Board(*boards.texts[2])
+        first = trace(board, 2, 200)
+        self.assertEqual(trace(board, 2, 200), first)
+        self.assertNotEqual(trace(board, 3, 200), first)
+        # robots start to appear once the spawn delay is over
+        self.assertEqual(len(first[rules.SPAWN - 1][0]), 1)
+        self.assertEqual(len(first[rules.SPAWN][0]), 2)
+
+    def test_ignores_unknown_commands(self):
+        game = rules.Game(rules.Field([' ' * 15, '_' * 15]), random.Random(0), robots=0)
+        game.step('right')
+        game.step('upleft')
+        self.assertEqual(game.you.vector, (1, 0))
+        self.assertEqual((game.you.row, game.you.column), (1, 11))
+
+class NavigatorTest(unittest.TestCase):
+
+    LINES = ['__|___',
+             '  |   ',
+             '__|___']
+
+    def test_direction(self):
+        navigator = rules.Navigator(rules.Field(self.LINES))
+        self.assertEqual(navigator.moves(1, 2), (((0, -1), (0, 2)), ((0, 1), (2, 2))))
+        self.assertEqual(navigator.distances((2, 5))[0, 0], 7)
+        # along the floor, down the ladder, and along the floor again
+        self.assertEqual(navigator.direction(0, 0, (2, 5)), (1, 0))
+        self.assertEqual(navigator.direction(0, 2, (2, 5)), (0, 1))
+        self.assertEqual(navigator.direction(2, 2, (2, 5)), (1, 0))
+        self.assertEqual(navigator.direction(2, 2, (0, 5)), (0, -1))
+        self.assertIsNone(navigator.direction(2, 5, (2, 5)))
+
+    def test_dig_and_fill(self):
+        field = rules.Field(self.LINES)
+        navigator = rules.Navigator(field)
+        field.watch(navigator.changed)
+        self.assertEqual(navigator.direction(2, 2, (2, 5)), (1, 0))
+        field.cache_write(2, 3, ' ')
+        # the only way across the hole is off the bottom of the board
+        self.assertIsNone(navigator.direction(2, 2, (2, 5)))
+        field.cache_write(2, 3, '_')
+        self.assertEqual(navigator.direction(2, 2, (2, 5)), (1, 0))
+
+    def test_changes_match_a_new_navigator(self):
+        field = rules.Field.from_board(boards.Board(*boards.texts[2]))
+        navigator = rules.Navigator(field)
+        field.watch(navigator.changed)
+        cells = [(row, column) for row in range(field.height) for column in range(field.width)]
+        rng = random.Random(0)
+        for change in range(40):
+            row, column = rng.choice([cell for cell in cells if field.cache_read(*cell) in '_ '])
+            before = dict((cell, navigator.moves(*cell)) for cell in cells)
+            field.cache_write(row, column, ' ' if field.cache_read(row, column) == '_' else '_')
+            fresh = rules.Navigator(field)
+            for cell in cells:
+                self.assertEqual(navigator.moves(*cell), fresh.moves(*cell), cell)
+                # only the rows next to the change and two columns each way are found again
+                if abs(cell[0] - row) > 1 or abs(cell[1] - column) > 2:
+                    self.assertIs(navigator.moves(*cell), before[cell], cell)
+            target = field.find('_')[-1]
+            self.assertEqual(navigator.distances(target), fresh.distances(target))
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main()
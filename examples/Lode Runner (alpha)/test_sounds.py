@@ -0,0 +1,155 @@
+#! /usr/bin/env python3
+'Tests for the source.sounds module.'
+
+################################################################################
+
+import os
+import threading
+import time
+import unittest
+
+from source import audio
+from source import sounds
+
+################################################################################
+
+THEME = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'themes', 'version_2.1', 'theme_config.xml')
+NAMES = 'kill', 'lose', 'move_high', 'move_low', 'score', 'win', 'zip'
+
+class Gated(audio.Null):
+
+    'A Null backend that holds each sample until the gate opens.'
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.busy = threading.Event()
+        self.order = []
+
+    def play(self, sample):
+        self.busy.set()
+        self.gate.wait()
+        super().play(sample)
+        self.order.append(sample)
+
+class History:
+
+    'Keeps the sound requests that a recorder would be given.'
+
+    def __init__(self):
+        self.sounds = []
+
+    def sound(self, name, block=False):
+        self.sounds.append((name, block))
+
+def samples():
+    'Return a sample of a different length for each sound name.'
+    return dict((name, audio.synthesize([(0.0, 440, 10 * (number + 1))])) for number, name in enumerate(NAMES))
+
+################################################################################
+
+class MixerTest(unittest.TestCase):
+
+    def test_unknown(self):
+        backend = audio.Null()
+        mixer = sounds.Mixer(samples(), backend)
+        mixer.play('thunder')
+        self.assertTrue(mixer.wait(5))
+        stats = mixer.stats()
+        self.assertEqual((stats['requested'], stats['unknown'], stats['played']), (1, 1, 0))
+        self.assertEqual(backend.played, 0)
+
+    def test_coalesced_within_window(self):
+        backend = audio.Null()
+        mixer = sounds.Mixer(samples(), backend, window=60)
+        for repeat in range(3):
+            mixer.play('zip')
+        mixer.play('zip', True)
+        stats = mixer.stats()
+        self.assertEqual((stats['requested'], stats['coalesced'], stats['played']), (4, 2, 2))
+        self.assertEqual(backend.played, 2)
+
+    def test_repeats_after_window(self):
+        backend = audio.Null()
+        mixer = sounds.Mixer(samples(), backend, window=0.01)
+        mixer.play('zip')
+        time.sleep(0.05)
+        mixer.play('zip')
+        self.assertTrue(mixer.wait(5))
+        self.assertEqual(mixer.stats()['coalesced'], 0)
+        self.assertEqual(backend.played, 2)
+
+    def test_priority_order(self):
+        table = samples()
+        backend = Gated()
+        mixer = sounds.Mixer(table, backend, window=60)
+        mixer.play('move_low')
+        self.assertTrue(backend.busy.wait(5))
+        for name in 'move_high', 'score', 'win', 'kill', 'zip':
+            mixer.play(name)
+        backend.gate.set()
+        self.assertTrue(mixer.wait(5))
+        # highest priority first, then the newest of equal priority
+        self.assertEqual(backend.order, [table[name] for name in ('move_low', 'win', 'kill', 'score', 'zip', 'move_high')])
+
+    def test_stale_requests_are_dropped(self):
+        table = samples()
+        backend = Gated()
+        mixer = sounds.Mixer(table, backend, window=0.05)
+        mixer.play('move_low')
+        self.assertTrue(backend.busy.wait(5))
+        mixer.play('score')
+        blocked = threading.Thread(target=mixer.play, args=('win', True))
+        blocked.start()
+        time.sleep(0.2)
+        backend.gate.set()
+        blocked.join(5)
+        self.assertTrue(mixer.wait(5))
+        stats = mixer.stats()
+        self.assertEqual((stats['played'], stats['dropped']), (2, 1))
+        self.assertEqual(backend.order, [table['move_low'], table['win']])
+
+    def test_latency(self):
+        backend = Gated()
+        mixer = sounds.Mixer(samples(), backend, window=60)
+        mixer.play('move_low')
+        self.assertTrue(backend.busy.wait(5))
+        mixer.play('score')
+        time.sleep(0.1)
+        backend.gate.set()
+        self.assertTrue(mixer.wait(5))
+        stats = mixer.stats()
+        self.assertGreaterEqual(stats['worst'], 0.1)
+        self.assertLessEqual(stats['latency'], stats['worst'])
+        self.assertAlmostEqual(stats['latency'] * 2, mixer.latency)
+
+    def test_failing_backend(self):
+        class Broken(audio.Null):
+            def play(self, sample):
+                raise OSError('no sound device')
+        mixer = sounds.Mixer(samples(), Broken())
+        mixer.play('zip', True)
+        mixer.play('win', True)
+        self.assertEqual(mixer.stats()['failed'], 2)
+
+################################################################################
+
+class ServerTest(unittest.TestCase):
+
+    def test_theme(self):
+        backend = audio.Null()
+        history = History()
+        server = sounds.Server(THEME, history, backend)
+        self.assertEqual((server.TITLE_COLOR, server.BACKGROUND_COLOR), ('white', 'black'))
+        self.assertEqual(sorted(server.mixer.sounds), list(NAMES))
+        server.play('score', True)
+        server.play('thunder')
+        self.assertEqual(history.sounds, [('score', True), ('thunder', False)])
+        self.assertEqual(backend.played, 1)
+        self.assertAlmostEqual(backend.seconds, 0.05, 3)
+        self.assertEqual(server.mixer.stats()['unknown'], 1)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+#! /usr/bin/env python3
+'Tests for the source.util module.'
+
+################################################################################
+
+import unittest
+
+from source import rules
+from source import util
+
+################################################################################
+
+LINES = ['  *  ',
+         '_|___',
+         ' |   ',
+         '_____']
+
+class Canvas:
+
+    'Keeps the drawing calls that a Tk canvas would be given.'
+
+    def __init__(self):
+        self.calls = []
+        self.handles = 0
+
+    def create_image(self, coords, image):
+        self.handles += 1
+        self.calls.append(('create', coords, image))
+        return self.handles
+
+    def delete(self, handle):
+        self.calls.append(('delete', handle))
+
+    def tag_raise(self, handle, below):
+        self.calls.append(('raise', handle, below))
+
+    def update(self):
+        pass
+
+class History:
+
+    'Keeps copies of the frames and cells that a recorder would be given.'
+
+    def __init__(self):
+        self.frames = []
+
+    def frame(self, frame, cells):
+        self.frames.append(([list(row) for row in frame], set(cells)))
+
+def screen(lines):
+    'Return a Screen3 over the lines that draws on a Canvas.'
+    screen = util.Screen3.__new__(util.Screen3)
+    screen.field = rules.Field(lines)
+    screen.height, screen.width = screen.field.height, screen.field.width
+    screen.IMAGE_WIDTH = screen.IMAGE_HEIGHT = 17
+    screen.HISTORY = History()
+    screen._Screen3__images = dict((key, util.Screen3.IMAGE_MAP[key]) for key in util.Screen3.IMAGE_MAP)
+    screen._Screen3__canvas = Canvas()
+    screen._Screen3__hand = [[None] * screen.width for row in range(screen.height)]
+    screen._Screen3__start()
+    return screen
+
+################################################################################
+
+class ScreenTest(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = screen(LINES)
+        self.canvas = self.screen._Screen3__canvas
+        self.frames = self.screen.HISTORY.frames
+        self.assertEqual(len(self.canvas.calls), sum(len(line.replace(' ', '')) for line in LINES))
+        del self.canvas.calls[:]
+
+    def test_first_frame(self):
+        self.screen.update()
+        frame, cells = self.frames[0]
+        self.assertEqual(len(cells), 20)
+        self.assertEqual(frame, self.screen.field.frame())
+        self.assertEqual(self.canvas.calls, [])
+        self.assertEqual(self.screen.field.dirty, set())
+
+    def test_only_dirty_cells_are_drawn(self):
+        self.screen.update()
+        self.screen.write(2, 0, '^')
+        self.screen.update()
+        you = self.canvas.handles
+        self.assertEqual(self.canvas.calls, [('create', (9, 43), 'you')])
+        self.assertEqual(self.frames[-1][1], {(2, 0)})
+        self.assertEqual(self.frames[-1][0][2][0], (' ', '^'))
+        # moving on redraws the cell that was left and the one entered
+        del self.canvas.calls[:]
+        self.screen.write(2, 1, '^')
+        self.screen.update()
+        self.assertEqual(sorted(self.canvas.calls, key=repr), [('create', (26, 43), 'you'), ('delete', you)])
+        self.assertEqual(self.frames[-1][1], {(2, 0), (2, 1)})
+        self.assertEqual(self.frames[-1][0][2][:2], [(' ', None), ('|', '^')])
+
+    def test_environment_under_actor(self):
+        self.screen.update()
+        floor = self.screen._Screen3__hand[1][3][0][0]
+        self.screen.cache_write(1, 3, ' ')
+        self.screen.write(0, 3, '&')
+        self.screen.update()
+        self.assertEqual(self.canvas.calls, [('create', (60, 9), 'robot'), ('delete', floor)])
+        self.assertEqual(self.frames[-1][1], {(0, 3), (1, 3)})
+        self.assertEqual(self.frames[-1][0][0][3], (' ', '&'))
+        self.assertEqual(self.frames[-1][0][1][3], (' ', None))
+        # a floor put back under a robot is drawn below it
+        del self.canvas.calls[:]
+        self.screen.cache_write(1, 3, '_')
+        self.screen.write(1, 3, '&')
+        self.screen.update()
+        robot, floor = self.canvas.handles - 1, self.canvas.handles
+        self.assertEqual(self.canvas.calls, [('delete', robot - 1), ('create', (60, 26), 'robot'),
+                                             ('create', (60, 26), 'floor'), ('raise', robot, floor)])
+        self.assertEqual(self.frames[-1][0][1][3], ('_', '&'))
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#! /usr/bin/env python3
+'Tests for the source.validate module.'
+
+################################################################################
+
+import unittest
+
+from source import boards
+from source import rules
+from source import validate
+
+################################################################################
+
+def route(text, exact):
+    'Return the route length that one of the route finders gives the board.'
+    field = rules.Field.from_board(boards.Board('Route', text))
+    graph = validate._graph(field, rules.Navigator(field))
+    reach = validate._reach(graph, validate.START)
+    while validate._cut(field, graph, reach):
+        reach = validate._reach(graph, validate.START)
+    finder = validate._exact_route if exact else validate._greedy_route
+    return finder(graph, reach, field.find('*'))
+
+################################################################################
+
+class CheckTest(unittest.TestCase):
+
+    def test_builtin_boards_pass(self):
+        for name, text in boards.texts:
+            result = validate.check(name, text)
+            self.assertTrue(result.ok, str(result))
+            self.assertEqual(result.exact, result.loads <= validate.EXACT)
+
+    def test_unreachable_load(self):
+        result = validate.check('Out of Reach', '\n' + '\n'.join(['   *                ',
+                                                                  '____________________']))
+        self.assertFalse(result.ok)
+        self.assertEqual(result.lost_loads, [(0, 3)])
+        self.assertEqual(str(result), 'Out of Reach: UNSOLVABLE (1 of 1 loads unreachable [(0, 3)])')
+
+    def test_cut_through_floor(self):
+        result = validate.check('Dig Down', '\n' + '\n'.join(['                    ',
+                                                              '____________________',
+                                                              '                    ',
+                                                              '___*________________']))
+        self.assertTrue(result.ok, str(result))
+        # fall onto the floor, step aside, fall through the cut, and walk
+        self.assertEqual(result.route, 1 + 1 + 2 + 6)
+
+    def test_bad_board(self):
+        result = validate.check('Bad', '\n _ \n_x_')
+        self.assertIsNotNone(result.error)
+        self.assertIn('INVALID', str(result))
+
+    def test_run(self):
+        results = list(validate.run(boards.texts[:2], 2))
+        self.assertEqual([result.name for result in results], [name for name, text in boards.texts[:2]])
+
+################################################################################
+
+class RouteTest(unittest.TestCase):
+
+    def test_routes_agree_on_a_line(self):
+        text = '\n' + '\n'.join(['                    ',
+                                 '____________*_*__*__'])
+        self.assertEqual(route(text, True), route(text, False))
+        self.assertEqual(route(text, True), 1 + 2 + 2 + 3)
+
+    def test_nearest_load_first_can_be_longer(self):
+        text = '\n' + '\n'.join(['                    ',
+                                 '_*__*___*____*_*__*_'])
+        # right to the end and back beats going to the nearest load first
+        self.assertEqual(route(text, True), 1 + 8 + 17)
+        self.assertEqual(route(text, False), 1 + 9 + 17)
+
+    def test_greedy_is_never_shorter(self):
+        name, text = boards.texts[0]
+        exact = route(text, True)
+        self.assertLessEqual(validate.check(name, text).loads, validate.EXACT)
+        self.assertEqual(validate.check(name, text).route, exact)
+        self.assertGreaterEqual(route(text, False), exact)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main()